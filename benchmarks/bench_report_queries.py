@@ -0,0 +1,119 @@
+"""
+Benchmark query laporan bulanan: filter strftime() lama vs range half-open + agregat satu query.
+
+Usage: python benchmarks/bench_report_queries.py [--rows 1000000] [--repeat 5]
+
+Database dibuat di direktori sementara, tidak menyentuh flood_system.db.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LEGACY_MONTH_REPORTS = '''
+    SELECT * FROM flood_reports
+    WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
+    ORDER BY report_date DESC, created_at DESC
+'''
+
+LEGACY_STATISTICS = [
+    '''SELECT COUNT(*) FROM flood_reports
+       WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')''',
+    '''SELECT COUNT(DISTINCT report_date) FROM flood_reports
+       WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')''',
+    '''SELECT flood_height, COUNT(*) as count FROM flood_reports
+       WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
+       GROUP BY flood_height ORDER BY count DESC LIMIT 1''',
+    '''SELECT address, COUNT(*) as count FROM flood_reports
+       WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
+       GROUP BY address ORDER BY count DESC LIMIT 1''',
+]
+
+FLOOD_HEIGHTS = ["Setinggi mata kaki", "Setinggi betis", "Setinggi lutut", "Setinggi paha",
+                 "Setinggi pinggang", "Setinggi dada", "Setinggi leher", "Lebih dari leher"]
+
+def populate(model, rows, days=5 * 365):
+    """Isi flood_reports dengan laporan acak tersebar selama `days` hari terakhir"""
+    rng = random.Random(42)
+    today = date.today()
+    conn = model.get_connection()
+    batch = []
+    for i in range(rows):
+        report_date = (today - timedelta(days=rng.randrange(days))).isoformat()
+        batch.append((
+            f"Jl. Contoh No. {rng.randrange(5000)}, Desa {rng.randrange(300)}",
+            rng.choice(FLOOD_HEIGHTS),
+            f"Pelapor {rng.randrange(20000)}",
+            report_date,
+            f"{report_date} {rng.randrange(24):02d}:{rng.randrange(60):02d}:00"
+        ))
+        if len(batch) == 50000:
+            conn.executemany('''INSERT INTO flood_reports (address, flood_height, reporter_name, report_date, created_at)
+                                VALUES (?, ?, ?, ?, ?)''', batch)
+            batch = []
+    if batch:
+        conn.executemany('''INSERT INTO flood_reports (address, flood_height, reporter_name, report_date, created_at)
+                            VALUES (?, ?, ?, ?, ?)''', batch)
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+
+def timed(func, repeat):
+    """Median waktu eksekusi (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark query laporan bulanan")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='flood_bench_')
+    os.chdir(workdir)
+
+    from models.FloodReportModel import FloodReportModel
+    model = FloodReportModel()
+
+    print(f"🔧 Mengisi {args.rows:,} laporan di {workdir} ...")
+    start = time.perf_counter()
+    populate(model, args.rows)
+    print(f"   selesai dalam {time.perf_counter() - start:.1f}s")
+
+    conn = model.get_connection()
+
+    def legacy_month_reports():
+        conn.execute(LEGACY_MONTH_REPORTS).fetchall()
+
+    def legacy_statistics():
+        for query in LEGACY_STATISTICS:
+            conn.execute(query).fetchall()
+
+    results = [
+        ('get_month_reports', timed(legacy_month_reports, args.repeat),
+         timed(model.get_month_reports, args.repeat)),
+        ('get_monthly_statistics', timed(legacy_statistics, args.repeat),
+         timed(model.get_monthly_statistics, args.repeat)),
+    ]
+
+    plan = conn.execute('EXPLAIN QUERY PLAN SELECT * FROM flood_reports WHERE report_date >= ? AND report_date < ?',
+                        model.get_month_range()).fetchall()
+    conn.close()
+
+    print(f"\n{'query':<26}{'strftime (ms)':>15}{'range (ms)':>14}{'speedup':>10}")
+    for name, legacy_ms, new_ms in results:
+        print(f"{name:<26}{legacy_ms:>15.2f}{new_ms:>14.2f}{legacy_ms / new_ms:>9.1f}x")
+    print("\nQuery plan (range):", '; '.join(row[-1] for row in plan))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark parser tabel stasiun BBWS: BeautifulSoup (pohon penuh) vs streaming lxml + hash per baris.
+
+Usage: python benchmarks/bench_station_parser.py [--scale 20] [--repeat 50]
+
+Memakai halaman rekaman fixtures/bbws/tma.html dan ch.html; --scale mengulang baris tabel
+untuk mensimulasikan halaman dengan lebih banyak pos.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from controllers.BBWSScraper import RAINFALL_COLUMNS, WATER_COLUMNS
+from controllers.StationTableParser import StationChangeTracker, map_columns, parse_station_rows
+
+def naive_parse(html, column_spec):
+    """Parse seperti versi awal BBWSScraper: BeautifulSoup html.parser, seluruh dokumen"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for table in soup.find_all('table'):
+        mapping = map_columns([th.get_text(strip=True) for th in table.find_all('th')], column_spec)
+        if 'location' not in mapping or len(mapping) < 2:
+            continue
+        rows = []
+        for tr in table.find_all('tr'):
+            cells = [td.get_text(strip=True) for td in tr.find_all('td')]
+            if len(cells) > max(mapping.values()):
+                rows.append({field: cells[index] for field, index in mapping.items()})
+        return rows
+    return []
+
+def load_fixture(name, scale):
+    """Baca fixture dan ulang baris <tbody> sebanyak scale kali (nama pos diberi suffix agar unik)"""
+    with open(os.path.join(ROOT, 'fixtures', 'bbws', name), encoding='utf-8') as f:
+        html = f.read()
+    body = re.search(r'<tbody>(.*?)</tbody>', html, re.S).group(1)
+    copies = [re.sub(r'(<a [^>]*>)([^<]+)</a>', rf'\1\2 #{i}</a>', body) for i in range(scale)]
+    return html.replace(body, ''.join(copies))
+
+def timed(func, repeat):
+    """Median waktu eksekusi (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser tabel stasiun BBWS")
+    parser.add_argument('--scale', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"\n{'halaman':<10}{'baris':>8}{'bs4 (ms)':>12}{'lxml (ms)':>12}{'speedup':>10}{'berubah':>10}")
+    for name, column_spec in (('tma.html', WATER_COLUMNS), ('ch.html', RAINFALL_COLUMNS)):
+        html = load_fixture(name, args.scale)
+        naive_rows = naive_parse(html, column_spec)
+        fast_rows = parse_station_rows(html, column_spec)
+        assert naive_rows == fast_rows, f"hasil parse berbeda untuk {name}"
+
+        naive_ms = timed(lambda: naive_parse(html, column_spec), args.repeat)
+        fast_ms = timed(lambda: parse_station_rows(html, column_spec), args.repeat)
+
+        # Poll kedua tanpa perubahan: hanya hash, tidak ada baris yang diteruskan
+        tracker = StationChangeTracker()
+        tracker.diff(name, fast_rows)
+        changed = len(tracker.diff(name, parse_station_rows(html, column_spec)))
+
+        print(f"{name:<10}{len(fast_rows):>8}{naive_ms:>12.2f}{fast_ms:>12.2f}"
+              f"{naive_ms / fast_ms:>9.1f}x{changed:>10}")
+
+if __name__ == "__main__":
+    main()
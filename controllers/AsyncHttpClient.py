@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from collections import namedtuple
+
+import aiohttp
+
+# body selalu berisi halaman terakhir yang valid (dari cache jika upstream membalas 304)
+FetchResult = namedtuple('FetchResult', ['url', 'status', 'body', 'not_modified', 'elapsed_ms', 'error'])
+
+class AsyncHttpClient:
+    """
+    Klien HTTP asyncio untuk polling upstream dari kode sinkron (Streamlit / scheduler).
+
+    - Satu event loop + ClientSession di thread background, koneksi keep-alive dipakai ulang antar poll
+    - Semua URL di-fetch bersamaan (dibatasi `concurrency`), jadi satu poll ~ satu round-trip
+    - Conditional request: ETag/Last-Modified disimpan per URL, respons 304 memakai body tersimpan
+    """
+
+    def __init__(self, concurrency=8, timeout=10.0, connect_timeout=5.0,
+                 user_agent='flood-warning-system/1.0 (+BBWS Bengawan Solo monitor)'):
+        self.concurrency = concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.headers = {'User-Agent': user_agent, 'Accept': 'text/html'}
+        self._validators = {}  # url -> (etag, last_modified, body)
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='http-client', daemon=True)
+                self._thread.start()
+        return self._loop
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, headers=self.headers)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def _fetch(self, session, url):
+        headers = {}
+        cached = self._validators.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        start = time.perf_counter()
+        try:
+            async with self._semaphore:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304 and cached:
+                        return FetchResult(url, 304, cached[2], True, (time.perf_counter() - start) * 1000, None)
+                    body = await response.text()
+                    if response.status == 200:
+                        self._validators[url] = (response.headers.get('ETag'),
+                                                 response.headers.get('Last-Modified'), body)
+                        return FetchResult(url, 200, body, False, (time.perf_counter() - start) * 1000, None)
+                    # Error HTTP (mis. 502): sama seperti error jaringan, pakai halaman terakhir jika ada
+                    return FetchResult(url, response.status, cached[2] if cached else None, False,
+                                       (time.perf_counter() - start) * 1000, f"HTTP {response.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Upstream lambat/putus: pakai halaman terakhir jika ada
+            body = cached[2] if cached else None
+            return FetchResult(url, None, body, False, (time.perf_counter() - start) * 1000,
+                               f"{type(e).__name__}: {e}")
+
+    async def _fetch_many(self, urls):
+        session = await self._get_session()
+        return await asyncio.gather(*(self._fetch(session, url) for url in urls))
+
+    def fetch_all(self, urls):
+        """Fetch semua URL bersamaan; return {url: FetchResult} (tidak pernah raise untuk error HTTP)"""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._fetch_many(list(urls)), loop)
+        # Batas atas: semua batch concurrency berjalan sampai timeout
+        waves = max(1, -(-len(urls) // self.concurrency))
+        results = future.result(timeout=self.timeout.total * waves + 5)
+        return {result.url: result for result in results}
+
+    def close(self):
+        """Tutup session dan hentikan event loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(timeout=5)
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
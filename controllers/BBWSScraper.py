@@ -1,37 +1,142 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from datetime import datetime
-import streamlit as st
+import atexit
+import os
 import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+from controllers.AsyncHttpClient import AsyncHttpClient
+from controllers.StationTableParser import StationChangeTracker, parse_station_rows
+
+DEFAULT_BASE_URL = "https://hidrologi.bbws-bsolo.net"
+WATER_LEVEL_PATH = "/tma"
+RAINFALL_PATH = "/ch"
+
+# Jam di halaman BBWS adalah WIB
+WIB = timezone(timedelta(hours=7))
+
+# Kata kunci header tabel -> field record (dicocokkan lowercase, yang pertama cocok menang)
+WATER_COLUMNS = [('location', ('nama pos', 'pos', 'lokasi')), ('water_level_mdpl', ('tma', 'tinggi')),
+                 ('time', ('jam', 'waktu')), ('date', ('tanggal',)), ('status', ('status',))]
+RAINFALL_COLUMNS = [('location', ('nama pos', 'pos')), ('rainfall_mm', ('hujan', 'ch')),
+                    ('time', ('jam', 'waktu')), ('date', ('tanggal',))]
+
+def parse_number(text):
+    """'143,74' / '143.74' -> 143.74; '-' / kosong -> None"""
+    text = (text or '').strip().replace(',', '.')
+    match = re.search(r'-?\d+(?:\.\d+)?', text)
+    return float(match.group()) if match else None
+
+def parse_observed_at(date_text, time_text):
+    """'18-10-2026' + '06:00' (WIB) -> epoch detik UTC; None jika tidak lengkap/tidak valid"""
+    try:
+        observed = datetime.strptime(f"{date_text.strip()} {time_text.strip()}", '%d-%m-%Y %H:%M')
+    except (AttributeError, ValueError):
+        return None
+    return int(observed.replace(tzinfo=WIB).timestamp())
 
 class BBWSScraper:
-    def __init__(self):
-        self.base_url = "https://hidrologi.bbws-bsolo.net"
-    
+    def __init__(self, base_url=None, concurrency=8, timeout=10.0):
+        # BBWS_BASE_URL bisa diarahkan ke stand-in lokal (fixtures/bbws_server.py)
+        self.base_url = (base_url or os.environ.get('BBWS_BASE_URL', DEFAULT_BASE_URL)).rstrip('/')
+        self.client = get_http_client(concurrency, timeout)
+        self.last_fetch = {}  # path -> FetchResult terakhir (status, not_modified, elapsed_ms, error)
+        self.change_tracker = StationChangeTracker()
+
+    def fetch_pages(self, paths):
+        """Fetch beberapa halaman sekaligus (paralel); return {path: html atau None}"""
+        results = self.client.fetch_all([self.base_url + path for path in paths])
+        pages = {}
+        for path in paths:
+            result = results[self.base_url + path]
+            self.last_fetch[path] = result
+            if result.error:
+                print(f"⚠️ BBWS {path}: {result.error}")
+            pages[path] = result.body
+        return pages
+
+    def parse_station_table(self, html, column_spec):
+        """Baris tabel stasiun -> list dict field mentah (streaming lxml, lihat StationTableParser)"""
+        return parse_station_rows(html, column_spec)
+
+    def parse_water_levels(self, html, rows=None):
+        """Halaman /tma -> record tinggi muka air (rows: baris mentah yang sudah di-parse)"""
+        records = []
+        for row in (rows if rows is not None else self.parse_station_table(html, WATER_COLUMNS)):
+            level = parse_number(row.get('water_level_mdpl'))
+            if not row['location'] or level is None:
+                continue
+            records.append({
+                'location': row['location'],
+                'water_level_mdpl': level,
+                'last_update': row.get('time', ''),
+                'observed_at': parse_observed_at(row.get('date'), row.get('time')),
+                'source': 'BBWS Bengawan Solo',
+                'status': (row.get('status') or 'RENDAH').upper()
+            })
+        return records
+
+    def parse_rainfall(self, html, rows=None):
+        """Halaman /ch -> record curah hujan (pos tanpa data dilewati)"""
+        records = []
+        for row in (rows if rows is not None else self.parse_station_table(html, RAINFALL_COLUMNS)):
+            rainfall = parse_number(row.get('rainfall_mm'))
+            if not row['location'] or rainfall is None:
+                continue
+            records.append({
+                'location': row['location'],
+                'rainfall_mm': rainfall,
+                'last_update': row.get('time', ''),
+                'observed_at': parse_observed_at(row.get('date'), row.get('time')),
+                'source': 'BBWS Bengawan Solo'
+            })
+        return records
+
+    def scrape_all(self):
+        """
+        Ambil /tma dan /ch dalam satu round-trip; return (water_levels, rainfall).
+        Jika halaman tidak tersedia, record fallback (bertanda 'fallback': True) yang dikembalikan.
+        """
+        pages = self.fetch_pages([WATER_LEVEL_PATH, RAINFALL_PATH])
+        water = self.parse_water_levels(pages[WATER_LEVEL_PATH]) if pages[WATER_LEVEL_PATH] else []
+        rainfall = self.parse_rainfall(pages[RAINFALL_PATH]) if pages[RAINFALL_PATH] else []
+        return (water or self.get_fallback_water_data(), rainfall or self.get_fallback_rainfall_data())
+
+    def poll_changes(self):
+        """
+        Ambil /tma dan /ch lalu return hanya pembacaan yang berubah sejak poll sebelumnya:
+        {'water_levels': [...], 'rainfall': [...]}. Halaman 304 tidak di-parse, kecuali tracker belum
+        punya baseline: cache ETag dipakai bersama (scrape_all/scheduler), jadi poll pertama scraper
+        ini bisa mendapat 304 dan body dari cache tetap harus di-diff.
+        """
+        pages = self.fetch_pages([WATER_LEVEL_PATH, RAINFALL_PATH])
+        changes = {'water_levels': [], 'rainfall': []}
+        for path, kind, column_spec, to_records in (
+                (WATER_LEVEL_PATH, 'water_levels', WATER_COLUMNS, self.parse_water_levels),
+                (RAINFALL_PATH, 'rainfall', RAINFALL_COLUMNS, self.parse_rainfall)):
+            if not pages[path] or (self.last_fetch[path].not_modified and self.change_tracker.has_baseline(kind)):
+                continue
+            rows = self.change_tracker.diff(kind, self.parse_station_table(pages[path], column_spec))
+            changes[kind] = to_records(None, rows)
+        return changes
+
     def scrape_water_levels(self):
         """Scrape data tinggi muka air dari BBWS Bengawan Solo (/tma)"""
         try:
-            st.info("🔄 Mengambil data tinggi air dari BBWS Bengawan Solo...")
-            
-            # Untuk testing, kita gunakan data dummy dulu
-            # Nanti bisa diimplementasikan scraping real
-            return self.get_fallback_water_data()
+            html = self.fetch_pages([WATER_LEVEL_PATH])[WATER_LEVEL_PATH]
+            return (html and self.parse_water_levels(html)) or self.get_fallback_water_data()
             
         except Exception as e:
-            st.error(f"Error scraping water levels: {str(e)}")
+            print(f"❌ Error scraping water levels: {str(e)}")
             return self.get_fallback_water_data()
     
     def scrape_rainfall_data(self):
         """Scrape data curah hujan dari BBWS Bengawan Solo (/ch)"""
         try:
-            st.info("🔄 Mengambil data curah hujan dari BBWS Bengawan Solo...")
-            
-            # Untuk testing, kita gunakan data dummy dulu
-            return self.get_fallback_rainfall_data()
+            html = self.fetch_pages([RAINFALL_PATH])[RAINFALL_PATH]
+            return (html and self.parse_rainfall(html)) or self.get_fallback_rainfall_data()
             
         except Exception as e:
-            st.error(f"Error scraping rainfall data: {str(e)}")
+            print(f"❌ Error scraping rainfall data: {str(e)}")
             return self.get_fallback_rainfall_data()
     
     def get_fallback_water_data(self):
@@ -42,21 +147,24 @@ class BBWSScraper:
                 'water_level_mdpl': 143.74,  # LANGSUNG mdpl
                 'last_update': '06:00',
                 'source': 'BBWS Bengawan Solo',
-                'status': 'RENDAH'
+                'status': 'RENDAH',
+                'fallback': True
             },
             {
                 'location': 'Wonogiri Dam (Spillway)',
                 'water_level_mdpl': 131.43,  # LANGSUNG mdpl
                 'last_update': '06:00',
                 'source': 'BBWS Bengawan Solo',
-                'status': 'RENDAH'
+                'status': 'RENDAH',
+                'fallback': True
             },
             {
                 'location': 'Colo Weir (S. bengawan solo)',
                 'water_level_mdpl': 108.29,  # LANGSUNG mdpl
                 'last_update': '06:00',
                 'source': 'BBWS Bengawan Solo',
-                'status': 'RENDAH'
+                'status': 'RENDAH',
+                'fallback': True
             }
         ]
     
@@ -67,12 +175,34 @@ class BBWSScraper:
                 'location': 'Stasiun Hujan A',
                 'rainfall_mm': 45.5,
                 'last_update': '06:00',
-                'source': 'BBWS Bengawan Solo'
+                'source': 'BBWS Bengawan Solo',
+                'fallback': True
             },
             {
                 'location': 'Stasiun Hujan B', 
                 'rainfall_mm': 32.0,
                 'last_update': '06:00',
-                'source': 'BBWS Bengawan Solo'
+                'source': 'BBWS Bengawan Solo',
+                'fallback': True
             }
-        ]
\ No newline at end of file
+        ]
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client(concurrency=8, timeout=10.0):
+    """
+    Satu AsyncHttpClient per proses (koneksi + cache ETag dipakai bersama semua scraper).
+    concurrency/timeout ditentukan oleh pemanggil pertama; pemanggilan berikutnya dengan nilai
+    berbeda ditolak (ValueError) daripada diam-diam diabaikan.
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = AsyncHttpClient(concurrency=concurrency, timeout=timeout)
+                atexit.register(_http_client.close)
+    if _http_client.concurrency != concurrency or _http_client.timeout.total != timeout:
+        raise ValueError(f"HTTP client BBWS sudah dibuat dengan concurrency={_http_client.concurrency}, "
+                         f"timeout={_http_client.timeout.total}")
+    return _http_client
\ No newline at end of file
@@ -1,11 +1,19 @@
 from models.FloodReportModel import FloodReportModel
+from query_cache import cached_query, get_query_cache
+from controllers.PhotoStorage import PhotoStorage, PhotoUploadError
+from controllers.PhotoWorker import get_photo_worker
 import os
-import uuid
+
+# TTL cache (detik) untuk query laporan; di-invalidate saat ada laporan baru
+REPORTS_CACHE_NAMESPACE = 'flood_reports'
 
 class FloodReportController:
     def __init__(self):
         self.flood_model = FloodReportModel()
         self.upload_folder = "uploads"
+        self.photo_storage = PhotoStorage(self.upload_folder)
+        self.photo_worker = get_photo_worker(self.flood_model, self.photo_storage,
+                                             on_update=self._on_photo_processed)
         
         # Create upload folder if not exists
         if not os.path.exists(self.upload_folder):
@@ -24,7 +32,7 @@ class FloodReportController:
 
     def submit_report(self, address, flood_height, reporter_name, reporter_phone=None, photo_file=None):
         """Submit new flood report dengan limit validation"""
-        photo_path = None
+        stored_photo = None
         
         try:
             # Get client IP for limit validation
@@ -35,25 +43,23 @@ class FloodReportController:
             if not self.check_daily_limit(client_ip):
                 return False, "Maaf, kuota laporan hari ini telah penuh (maksimal 10 laporan per IP)"
             
-            # Handle photo upload
+            # Handle photo upload: simpan asli per hash konten, re-encode + thumbnail di PhotoWorker
             if photo_file is not None:
                 try:
-                    # Generate unique filename
-                    file_extension = photo_file.name.split('.')[-1].lower()
-                    filename = f"{uuid.uuid4()}.{file_extension}"
-                    photo_path = os.path.join(self.upload_folder, filename)
-                    
-                    print(f"📸 Saving photo to: {photo_path}")
-                    
-                    # Save uploaded file
-                    with open(photo_path, "wb") as f:
-                        f.write(photo_file.getbuffer())
+                    # Disalin per chunk (tidak pernah seluruh file di memori)
+                    stored_photo = self.photo_storage.store_upload(photo_file)
                     
-                    print("✅ Photo saved successfully")
+                    if stored_photo['created']:
+                        print(f"✅ Photo saved to: {stored_photo['photo_path']}")
+                    else:
+                        print(f"♻️ Duplicate photo, reusing: {stored_photo['photo_path']}")
                     
+                except PhotoUploadError as e:
+                    print(f"❌ Photo rejected: {e}")
+                    return False, f"Foto ditolak: {e}"
                 except Exception as e:
                     print(f"❌ Error saving photo: {e}")
-                    photo_path = None
+                    stored_photo = None
             
             # Create report in database
             print("💾 Saving report to database...")
@@ -62,45 +68,89 @@ class FloodReportController:
                 flood_height=flood_height,
                 reporter_name=reporter_name,
                 reporter_phone=reporter_phone,
-                photo_path=photo_path,
-                ip_address=client_ip
+                photo_path=stored_photo['photo_path'] if stored_photo else None,
+                ip_address=client_ip,
+                thumbnail_path=stored_photo['thumbnail_path'] if stored_photo else None
             )
             
             if report_id:
                 print(f"✅ Report saved successfully with ID: {report_id}")
+                if stored_photo and stored_photo['pending']:
+                    self.photo_worker.submit(report_id, stored_photo['photo_path'])
+                get_query_cache().invalidate(REPORTS_CACHE_NAMESPACE)
                 return True, "Laporan berhasil dikirim!"
             else:
                 print("❌ Failed to save report to database")
-                # Delete photo if database insert failed
-                if photo_path and os.path.exists(photo_path):
-                    os.remove(photo_path)
+                # Delete photo if database insert failed (foto duplikat milik laporan lain tidak dihapus)
+                if stored_photo and stored_photo['created']:
+                    self.photo_storage.delete(stored_photo)
                     print("🗑️ Deleted photo due to database error")
                 return False, "Gagal menyimpan laporan ke database"
                 
         except Exception as e:
             print(f"❌ Error submitting report: {e}")
             # Delete photo if error occurred
-            if photo_path and os.path.exists(photo_path):
-                os.remove(photo_path)
+            if stored_photo and stored_photo['created']:
+                self.photo_storage.delete(stored_photo)
                 print("🗑️ Deleted photo due to general error")
             return False, f"Error: {str(e)}"
 
-    def get_today_reports(self):
+    def _on_photo_processed(self, report_id):
+        """Dipanggil PhotoWorker setelah thumbnail laporan tersimpan"""
+        get_query_cache().invalidate(REPORTS_CACHE_NAMESPACE)
+
+    def validate_photo(self, photo_file):
+        """Cek ukuran + magic bytes upload sebelum submit; return (valid, pesan)"""
+        try:
+            self.photo_storage.check_upload(photo_file)
+            return True, f"File {photo_file.name} ({photo_file.size / 1024 / 1024:.2f}MB) siap diupload"
+        except PhotoUploadError as e:
+            return False, str(e)
+
+    def get_photo_worker_stats(self):
+        """Counter job pemrosesan foto (submitted/completed/retried/failed)"""
+        return self.photo_worker.stats()
+
+    @cached_query(REPORTS_CACHE_NAMESPACE, ttl=15)
+    def get_today_reports(self, as_dataframe=False):
         """Get today's flood reports"""
-        return self.flood_model.get_today_reports()
+        return self.flood_model.get_today_reports(as_dataframe)
+
+    @cached_query(REPORTS_CACHE_NAMESPACE, ttl=60)
+    def get_month_reports(self, year=None, month=None, as_dataframe=False):
+        """Get this month's flood reports (as_dataframe=True untuk analitik)"""
+        return self.flood_model.get_month_reports(year, month, as_dataframe)
+
+    @cached_query(REPORTS_CACHE_NAMESPACE, ttl=60)
+    def get_reports_page(self, search_term=None, flood_height=None, page_size=10, cursor=None,
+                         year=None, month=None):
+        """Get satu halaman laporan bulanan (keyset pagination) + total sesuai filter"""
+        return self.flood_model.get_reports_page(year, month, search_term, flood_height, page_size, cursor)
 
-    def get_month_reports(self):
-        """Get this month's flood reports"""
-        return self.flood_model.get_month_reports()
+    @cached_query(REPORTS_CACHE_NAMESPACE, ttl=60)
+    def search_reports(self, search_term, limit=50, year=None, month=None):
+        """Full-text search laporan berdasarkan alamat/nama pelapor"""
+        return self.flood_model.search_reports(search_term, limit, year, month)
 
-    def get_all_reports(self):
+    @cached_query(REPORTS_CACHE_NAMESPACE, ttl=60)
+    def get_month_distribution(self, year=None, month=None):
+        """Get distribusi laporan bulanan untuk chart"""
+        return self.flood_model.get_month_distribution(year, month)
+
+    @cached_query(REPORTS_CACHE_NAMESPACE, ttl=120)
+    def get_all_reports(self, as_dataframe=False):
         """Get all flood reports"""
-        return self.flood_model.get_all_reports()
+        return self.flood_model.get_all_reports(as_dataframe)
     
-    def get_monthly_statistics(self):
+    @cached_query(REPORTS_CACHE_NAMESPACE, ttl=60)
+    def get_monthly_statistics(self, year=None, month=None):
         """Get monthly statistics for reports"""
-        return self.flood_model.get_monthly_statistics()
+        return self.flood_model.get_monthly_statistics(year, month)
     
+    def get_cache_stats(self):
+        """Hit/miss counter query cache (semua namespace)"""
+        return get_query_cache().stats()
+
     def get_client_ip(self):
         """Get client IP address for limit validation"""
         try:
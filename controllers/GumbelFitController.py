@@ -0,0 +1,58 @@
+import numpy as np
+from models.RainfallMaximaModel import RainfallMaximaModel
+from gumbel_distribution import fit_gumbel_parameters, get_gumbel_parameters
+from rainfall_archive import RainfallArchive
+
+class GumbelFitController:
+    def __init__(self):
+        self.maxima_model = RainfallMaximaModel()
+
+    def add_annual_maxima(self, station, maxima):
+        """Tambah data maksimum tahunan baru untuk stasiun ({year: max_rainfall_mm})"""
+        return self.maxima_model.save_annual_maxima(station, maxima)
+
+    def get_station_fit(self, station, method='lmoments'):
+        """
+        Fit parameter Gumbel untuk satu stasiun.
+        Fitting di-cache per fingerprint data, jadi hanya dihitung ulang jika ada maksimum baru.
+        """
+        try:
+            values = [m['max_rainfall_mm'] for m in self.maxima_model.get_annual_maxima(station)]
+            # Data terlalu pendek atau konstan (beta = 0) -> pakai parameter default
+            if len(values) < 2 or max(values) == min(values):
+                return None
+
+            fit = fit_gumbel_parameters(values, method=method)
+            return dict(fit, station=station)
+        except Exception as e:
+            print(f"❌ Error fitting Gumbel for {station}: {e}")
+            return None
+
+    def get_all_station_fits(self, method='lmoments'):
+        """Fit parameter Gumbel untuk semua stasiun: {station: fit}"""
+        fits = {}
+        for station in self.maxima_model.get_stations():
+            fit = self.get_station_fit(station, method=method)
+            if fit:
+                fits[station] = fit
+        return fits
+
+    def get_station_parameters(self, station, method='lmoments'):
+        """Parameter Gumbel untuk display; fallback ke parameter default jika data belum cukup"""
+        return get_gumbel_parameters(self.get_station_fit(station, method=method))
+
+    def import_archive_maxima(self, archive=None, min_valid_days=300):
+        """Ekstrak maksimum tahunan semua stasiun dari arsip curah hujan harian lalu simpan"""
+        try:
+            archive = archive or RainfallArchive()
+            years, maxima = archive.annual_maxima(min_valid_days=min_valid_days)
+            imported = 0
+            for station, values in zip(archive.stations, maxima):
+                station_maxima = {int(year): float(value) for year, value in zip(years, values)
+                                  if not np.isnan(value)}
+                if station_maxima and self.maxima_model.save_annual_maxima(station, station_maxima):
+                    imported += 1
+            return imported
+        except Exception as e:
+            print(f"❌ Error importing rainfall archive: {e}")
+            return 0
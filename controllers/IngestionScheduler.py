@@ -0,0 +1,107 @@
+import atexit
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from types import MappingProxyType
+
+from controllers.BBWSScraper import BBWSScraper
+
+# Snapshot yang dipublikasikan scheduler; tidak pernah diubah setelah dibuat
+# (record prediksi dibungkus MappingProxyType, list jadi tuple)
+PredictionSnapshot = namedtuple('PredictionSnapshot', [
+    'predictions', 'water_levels', 'rainfall', 'generated_at', 'poll_ms', 'sequence', 'error', 'timings'
+])
+
+def _freeze(records):
+    return tuple(MappingProxyType(dict(record)) for record in records)
+
+class IngestionScheduler:
+    """
+    Satu thread per proses yang polling BBWSScraper setiap `interval` detik, menghitung prediksi
+    ANN + Gumbel lewat `compute(water_levels, rainfall) -> (predictions, timings_ms)` dan
+    mempublikasikan PredictionSnapshot.
+    Render dashboard hanya membaca referensi snapshot terakhir (tanpa I/O), jadi N viewer = 1 poll.
+    `on_snapshot(snapshot)` (opsional) dipanggil di thread scheduler setiap ada data baru.
+    Jika scraper memakai data fallback, snapshot tetap dipublikasikan dengan `error` terisi.
+    """
+
+    def __init__(self, scraper, compute, interval=60.0, on_snapshot=None):
+        self.scraper = scraper
+        self.compute = compute
+        self.on_snapshot = on_snapshot
+        self.interval = interval
+        self._snapshot = None
+        self._published = threading.Event()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ingestion-scheduler', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll_once()
+            # Tidur sampai jadwal berikutnya atau sampai refresh_now()/stop()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def poll_once(self):
+        """Satu siklus: scrape -> prediksi -> publikasi snapshot (error tidak menghentikan thread)"""
+        start = time.perf_counter()
+        previous = self._snapshot
+        sequence = previous.sequence + 1 if previous else 1
+        try:
+            water_levels, rainfall = self.scraper.scrape_all()
+            predictions, timings = self.compute(water_levels, rainfall)
+            fallback = any(record.get('fallback') for record in water_levels + rainfall)
+            error = "BBWS tidak tersedia, menampilkan data fallback" if fallback else None
+            snapshot = PredictionSnapshot(_freeze(predictions), _freeze(water_levels), _freeze(rainfall),
+                                          datetime.now(), (time.perf_counter() - start) * 1000, sequence, error,
+                                          MappingProxyType(dict(timings)))
+            fresh = True
+        except Exception as e:
+            print(f"❌ Ingestion scheduler: poll gagal: {e}")
+            if previous is None:
+                return None
+            # Tetap sajikan data terakhir, tandai error-nya
+            snapshot = previous._replace(error=str(e), sequence=sequence)
+            fresh = False
+
+        self._snapshot = snapshot  # swap referensi atomik, pembaca tidak perlu lock
+        self._published.set()
+
+        # Record fallback/tanpa waktu observasi disaring oleh on_snapshot sendiri
+        if self.on_snapshot and fresh:
+            try:
+                self.on_snapshot(snapshot)
+            except Exception as e:
+                print(f"❌ Ingestion scheduler: on_snapshot gagal: {e}")
+        return snapshot
+
+    def get_snapshot(self, wait=0.0):
+        """Snapshot terakhir; saat cold start bisa menunggu poll pertama hingga `wait` detik"""
+        if self._snapshot is None and wait:
+            self._published.wait(wait)
+        return self._snapshot
+
+    def refresh_now(self):
+        """Bangunkan thread untuk poll segera (tidak menunggu hasilnya)"""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_ingestion_scheduler(compute, interval=60.0, on_snapshot=None):
+    """Satu IngestionScheduler per proses (dibuat saat pertama dipakai)"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = IngestionScheduler(BBWSScraper(), compute, interval, on_snapshot)
+                atexit.register(_scheduler.stop)
+    return _scheduler
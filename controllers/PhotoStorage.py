@@ -0,0 +1,190 @@
+import hashlib
+import os
+import tempfile
+
+from PIL import Image, ImageOps
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024  # sama dengan batas di form laporan
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Magic bytes -> ekstensi file upload asli (dicek dari chunk pertama)
+UPLOAD_SIGNATURES = [
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+]
+
+class PhotoUploadError(ValueError):
+    """Upload ditolak (bukan gambar yang didukung atau terlalu besar)"""
+
+def detect_image_extension(header):
+    """Ekstensi dari magic bytes awal file, None jika bukan format yang didukung"""
+    for signature, extension in UPLOAD_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+class PhotoStorage:
+    """
+    Penyimpanan foto laporan berbasis hash konten (SHA-256).
+
+    - EXIF dibuang (orientasi diterapkan dulu agar foto tidak terputar)
+    - Foto besar di-resize ke sisi terpanjang max_dimension lalu di-encode ulang
+    - Thumbnail WebP untuk tampilan tabel
+    - Upload dengan isi yang sama hanya disimpan sekali
+
+    Layout: <root>/photos/ab/<sha256>.jpg dan <root>/thumbs/ab/<sha256>.webp.
+    Upload yang belum diproses (lihat PhotoWorker) disimpan apa adanya di
+    <root>/originals/ab/<sha256>.<ext> dan dihapus setelah turunannya jadi.
+    """
+
+    def __init__(self, root='uploads', max_dimension=1920, thumbnail_size=320, jpeg_quality=85, webp_quality=75):
+        self.root = root
+        self.max_dimension = max_dimension
+        self.thumbnail_size = thumbnail_size
+        self.jpeg_quality = jpeg_quality
+        self.webp_quality = webp_quality
+
+    def _paths(self, digest, extension):
+        photo_path = os.path.join(self.root, 'photos', digest[:2], f"{digest}.{extension}")
+        thumbnail_path = os.path.join(self.root, 'thumbs', digest[:2], f"{digest}.webp")
+        return photo_path, thumbnail_path
+
+    def _original_path(self, digest, extension):
+        return os.path.join(self.root, 'originals', digest[:2], f"{digest}.{extension}")
+
+    def is_original(self, path):
+        """True jika path adalah upload asli yang masih menunggu diproses"""
+        originals_dir = os.path.join(os.path.abspath(self.root), 'originals') + os.sep
+        return bool(path) and os.path.abspath(path).startswith(originals_dir)
+
+    def find_existing(self, digest):
+        """Path foto + thumbnail jika hash ini sudah pernah disimpan"""
+        for extension in ('jpg', 'png'):
+            photo_path, thumbnail_path = self._paths(digest, extension)
+            if os.path.exists(photo_path) and os.path.exists(thumbnail_path):
+                return photo_path, thumbnail_path
+        return None
+
+    def _write_atomic(self, path, image, **save_options):
+        """Tulis ke file sementara lalu rename, jadi pembaca tidak melihat file setengah jadi"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        image.save(tmp_path, **save_options)
+        os.replace(tmp_path, path)
+
+    def process(self, image, digest):
+        """Re-encode foto (tanpa EXIF, resolusi dibatasi) dan buat thumbnail; return (photo_path, thumbnail_path)"""
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        if max(image.size) > self.max_dimension:
+            image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+
+        # Image baru tanpa metadata: EXIF/GPS tidak ikut tersimpan
+        clean = Image.new(image.mode, image.size)
+        clean.paste(image)
+
+        extension = 'png' if has_alpha else 'jpg'
+        photo_path, thumbnail_path = self._paths(digest, extension)
+
+        if has_alpha:
+            self._write_atomic(photo_path, clean, format='PNG', optimize=True)
+        else:
+            self._write_atomic(photo_path, clean, format='JPEG', quality=self.jpeg_quality,
+                               optimize=True, progressive=True)
+
+        thumbnail = clean.copy()
+        thumbnail.thumbnail((self.thumbnail_size, self.thumbnail_size), Image.LANCZOS)
+        self._write_atomic(thumbnail_path, thumbnail, format='WEBP', quality=self.webp_quality, method=4)
+
+        return photo_path, thumbnail_path
+
+    def check_upload(self, upload, max_bytes=MAX_UPLOAD_BYTES):
+        """
+        Validasi upload tanpa membaca seluruh isinya: ukuran (dari atribut size jika ada)
+        dan magic bytes chunk pertama. Return ekstensi; raise PhotoUploadError jika ditolak.
+        """
+        size = getattr(upload, 'size', None)
+        if size is not None and size > max_bytes:
+            raise PhotoUploadError(f"File terlalu besar! {size / 1024 / 1024:.2f}MB > {max_bytes / 1024 / 1024:.0f}MB")
+
+        upload.seek(0)
+        header = upload.read(16)
+        upload.seek(0)
+        extension = detect_image_extension(header)
+        if extension is None:
+            raise PhotoUploadError("File bukan gambar JPG, PNG, GIF atau WebP")
+        return extension
+
+    def store_upload(self, upload, max_bytes=MAX_UPLOAD_BYTES, chunk_size=UPLOAD_CHUNK_SIZE):
+        """
+        Simpan upload (file-like, mis. UploadedFile Streamlit) apa adanya untuk diproses di background.
+        Disalin per chunk ke file sementara sambil di-hash, lalu di-rename atomik ke path hash konten,
+        jadi memori per upload hanya sebesar satu chunk.
+        Return dict photo_path, thumbnail_path, created (file baru dibuat pemanggil ini),
+        dan pending=True jika turunan (thumbnail) belum ada.
+        """
+        extension = self.check_upload(upload, max_bytes)
+
+        tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=f'.{extension}')
+        try:
+            hasher = hashlib.sha256()
+            written = 0
+            with os.fdopen(fd, 'wb') as f:
+                while True:
+                    chunk = upload.read(chunk_size)
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise PhotoUploadError(f"File terlalu besar! > {max_bytes / 1024 / 1024:.0f}MB")
+                    hasher.update(chunk)
+                    f.write(chunk)
+
+            digest = hasher.hexdigest()
+            existing = self.find_existing(digest)
+            if existing:
+                os.remove(tmp_path)
+                return {'photo_path': existing[0], 'thumbnail_path': existing[1], 'created': False, 'pending': False}
+
+            original_path = self._original_path(digest, extension)
+            created = not os.path.exists(original_path)
+            if created:
+                os.makedirs(os.path.dirname(original_path), exist_ok=True)
+                os.replace(tmp_path, original_path)
+            else:
+                os.remove(tmp_path)
+            return {'photo_path': original_path, 'thumbnail_path': None, 'created': created, 'pending': True}
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def process_original(self, original_path):
+        """Buat foto ter-encode ulang + thumbnail dari upload asli, lalu hapus aslinya"""
+        digest = os.path.splitext(os.path.basename(original_path))[0]
+        existing = self.find_existing(digest)
+        if existing is None:
+            with Image.open(original_path) as image:
+                image.load()
+                existing = self.process(image, digest)
+
+        # Upload asli masih membawa EXIF (lokasi GPS), jangan disimpan lebih lama dari perlu
+        if os.path.exists(original_path):
+            os.remove(original_path)
+        return existing
+
+    def delete(self, stored):
+        """Hapus file hasil store_upload() (hanya jika dibuat oleh pemanggil ini)"""
+        if not stored or not stored.get('created'):
+            return
+        for path in (stored['photo_path'], stored['thumbnail_path']):
+            if path and os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,122 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from controllers.PhotoStorage import PhotoStorage
+
+def process_photo_job(root, original_path, max_dimension, thumbnail_size):
+    """Dijalankan di proses worker: re-encode + thumbnail dari upload asli"""
+    storage = PhotoStorage(root, max_dimension=max_dimension, thumbnail_size=thumbnail_size)
+    return storage.process_original(original_path)
+
+class PhotoWorker:
+    """
+    Pool proses background untuk pemrosesan foto laporan (CPU-bound, di luar thread Streamlit).
+    submit_report hanya menyimpan upload asli lalu submit() job; setelah foto + thumbnail jadi,
+    baris laporan di-update. Job yang gagal diulang dengan jeda bertambah sampai max_retries.
+    """
+
+    def __init__(self, flood_model, storage, max_workers=None, max_retries=3, retry_delay=2.0, on_update=None):
+        self.flood_model = flood_model
+        self.storage = storage
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_update = on_update
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+        self._closed = False
+        self.counters = {'submitted': 0, 'completed': 0, 'retried': 0, 'failed': 0}
+
+    def _create_executor(self):
+        """Process pool (spawn: aman dipakai dari proses Streamlit yang multi-thread)"""
+        try:
+            return ProcessPoolExecutor(max_workers=self.max_workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+        except (OSError, NotImplementedError) as e:
+            print(f"⚠️ Process pool tidak tersedia, foto diproses di thread: {e}")
+            return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='photo-worker')
+
+    def submit(self, report_id, original_path, attempt=1):
+        """Jadwalkan pemrosesan foto untuk satu laporan (tidak menunggu hasilnya)"""
+        with self._lock:
+            if self._closed:
+                return False
+            if attempt == 1:
+                self.counters['submitted'] += 1
+            try:
+                future = self._executor.submit(process_photo_job, self.storage.root, original_path,
+                                               self.storage.max_dimension, self.storage.thumbnail_size)
+            except BrokenProcessPool:
+                # Worker mati (mis. OOM): buat pool baru lalu coba sekali lagi
+                self._executor = self._create_executor()
+                future = self._executor.submit(process_photo_job, self.storage.root, original_path,
+                                               self.storage.max_dimension, self.storage.thumbnail_size)
+        future.add_done_callback(lambda f: self._on_done(f, report_id, original_path, attempt))
+        return True
+
+    def _on_done(self, future, report_id, original_path, attempt):
+        try:
+            photo_path, thumbnail_path = future.result()
+        except Exception as e:
+            self._retry(report_id, original_path, attempt, e)
+            return
+
+        if self.flood_model.update_report_photo(report_id, photo_path, thumbnail_path):
+            with self._lock:
+                self.counters['completed'] += 1
+            if self.on_update:
+                self.on_update(report_id)
+        else:
+            self._retry(report_id, original_path, attempt, 'update database gagal')
+
+    def _retry(self, report_id, original_path, attempt, error):
+        with self._lock:
+            if self._closed or attempt >= self.max_retries:
+                self.counters['failed'] += 1
+                print(f"❌ Photo worker: laporan {report_id} gagal diproses ({error}), foto asli tetap dipakai")
+                return
+            self.counters['retried'] += 1
+
+        delay = self.retry_delay * (2 ** (attempt - 1))
+        print(f"⚠️ Photo worker: laporan {report_id} gagal ({error}), ulang dalam {delay:.0f}s")
+        timer = threading.Timer(delay, self.submit, args=(report_id, original_path, attempt + 1))
+        timer.daemon = True
+        timer.start()
+
+    def resume_pending(self):
+        """Submit ulang laporan yang fotonya belum diproses (mis. proses sebelumnya berhenti)"""
+        resumed = 0
+        for report_id, photo_path in self.flood_model.get_reports_without_thumbnail():
+            if self.storage.is_original(photo_path) and os.path.exists(photo_path):
+                resumed += self.submit(report_id, photo_path)
+        return resumed
+
+    def stats(self):
+        """Counter job foto"""
+        with self._lock:
+            return dict(self.counters)
+
+    def shutdown(self, wait=True):
+        """Hentikan pool; job yang masih berjalan ditunggu jika wait=True"""
+        with self._lock:
+            self._closed = True
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_photo_worker(flood_model, storage, on_update=None):
+    """Satu PhotoWorker per proses; foto yang tertunda dari run sebelumnya dilanjutkan"""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = PhotoWorker(flood_model, storage, on_update=on_update)
+                atexit.register(_worker.shutdown)
+                _worker.resume_pending()
+    return _worker
@@ -1,68 +1,72 @@
 import streamlit as st
-from model_ann import predict_flood_ann
-from gumbel_distribution import predict_flood_gumbel
+from controllers.IngestionScheduler import get_ingestion_scheduler
+from controllers.PredictionPipeline import PredictionPipeline
+from controllers.StationRegistry import get_station_registry
+from models.TimeSeriesModel import TimeSeriesModel
+from rolling_features import get_feature_engine
+
+# Batas tunggu poll pertama saat cold start; lewat dari ini render memakai data fallback
+# dan snapshot asli tampil di render berikutnya
+SNAPSHOT_WAIT_SECONDS = 0.3
 
 class RealTimeDataController:
     def __init__(self):
-        # Tidak perlu BBWSScraper, gunakan fallback data
-        pass
+        self.timeseries_model = TimeSeriesModel()
+        self.station_registry = get_station_registry()
+        # Buffer rolling 3/24/72 jam per stasiun, diisi dari time-series saat proses mulai
+        self.feature_engine = get_feature_engine(self.timeseries_model)
+        self.pipeline = PredictionPipeline(self.match_rainfall, feature_engine=self.feature_engine)
+        # Scraping + prediksi dijalankan scheduler background, controller hanya membaca snapshot
+        self.scheduler = get_ingestion_scheduler(self.build_predictions, on_snapshot=self.record_readings)
     
     def get_comprehensive_data(self):
-        """Ambil semua data real-time dan lakukan prediksi"""
+        """Ambil prediksi terbaru dari snapshot scheduler (tanpa request ke BBWS saat render)"""
         try:
-            # ✅ GUNAKAN FALLBACK DATA LANGSUNG TANPA SCRAPING
-            return self.get_fallback_predictions()
+            snapshot = self.scheduler.get_snapshot(wait=SNAPSHOT_WAIT_SECONDS)
+            if snapshot is None or not snapshot.predictions:
+                return self.get_fallback_predictions()
+            return list(snapshot.predictions)
             
         except Exception as e:
             st.error(f"Error getting comprehensive data: {str(e)}")
             return self.get_fallback_predictions()
     
+    def get_snapshot_info(self):
+        """Metadata snapshot terakhir (waktu, durasi poll, error) untuk ditampilkan di dashboard"""
+        snapshot = self.scheduler.get_snapshot()
+        if snapshot is None:
+            return None
+        return {
+            'generated_at': snapshot.generated_at,
+            'poll_ms': snapshot.poll_ms,
+            'sequence': snapshot.sequence,
+            'error': snapshot.error,
+            'timings': dict(snapshot.timings or {})
+        }
+    
+    def record_readings(self, snapshot):
+        """Simpan pembacaan snapshot ke time-series (duplikat per waktu observasi diabaikan)"""
+        self.timeseries_model.record_snapshot(snapshot.water_levels, snapshot.rainfall)
+    
+    def get_station_history(self, station, metric, start_ts, end_ts, resolution=None):
+        """Riwayat tinggi air / curah hujan satu stasiun (rollup jam/hari untuk range panjang)"""
+        return self.timeseries_model.get_series(station, metric, start_ts, end_ts, resolution)
+    
+    def build_predictions(self, water_levels, rainfall):
+        """Masukkan pembacaan baru ke buffer rolling lalu prediksi semua stasiun; return (predictions, timings_ms)"""
+        self.feature_engine.ingest(water_levels, rainfall)
+        return self.pipeline.run(water_levels, rainfall)
+    
+    def match_rainfall(self, water_levels, rainfall):
+        """Index pos hujan untuk setiap pos TMA (-1 jika tidak ada yang cocok), dari join registry stasiun"""
+        return self.station_registry.match_rainfall(water_levels, rainfall)
+    
     def get_fallback_predictions(self):
-        """Data fallback untuk prediksi - HAPUS cm"""
-        return [
-            {
-                'location': 'Ngadipiro (S. keduang)',
-                'water_level_mdpl': 143.74,
-                'rainfall_mm': 45.5,
-                'ann_risk': 0.32,
-                'ann_status': 'RENDAH',
-                'ann_message': 'Prediksi ANN: Aman, tetap waspada',
-                'gumbel_risk': 0.28,
-                'gumbel_status': 'RENDAH',
-                'gumbel_message': 'Distribusi Gumbel: Prob 18.7%',
-                'last_update': '06:00',
-                'source': 'BBWS Bengawan Solo',
-                'water_status': 'RENDAH'
-            },
-            {
-                'location': 'Wonogiri Dam (Spillway)',
-                'water_level_mdpl': 131.43,
-                'rainfall_mm': 32.0,
-                'ann_risk': 0.25,
-                'ann_status': 'RENDAH',
-                'ann_message': 'Prediksi ANN: Kondisi normal',
-                'gumbel_risk': 0.22,
-                'gumbel_status': 'RENDAH',
-                'gumbel_message': 'Distribusi Gumbel: Prob 15.2%',
-                'last_update': '06:00',
-                'source': 'BBWS Bengawan Solo',
-                'water_status': 'RENDAH'
-            },
-            {
-                'location': 'Colo Weir (S. bengawan solo)',
-                'water_level_mdpl': 108.29,
-                'rainfall_mm': 28.5,
-                'ann_risk': 0.18,
-                'ann_status': 'RENDAH',
-                'ann_message': 'Prediksi ANN: Kondisi aman',
-                'gumbel_risk': 0.15,
-                'gumbel_status': 'RENDAH',
-                'gumbel_message': 'Distribusi Gumbel: Prob 12.8%',
-                'last_update': '06:00',
-                'source': 'BBWS Bengawan Solo',
-                'water_status': 'RENDAH'
-            }
-        ]
+        """Prediksi dari data fallback scraper (dipakai sebelum snapshot pertama tersedia)"""
+        scraper = self.scheduler.scraper
+        # Data fallback tidak dimasukkan ke buffer rolling
+        predictions, _ = self.pipeline.run(scraper.get_fallback_water_data(), scraper.get_fallback_rainfall_data())
+        return predictions
     
     def get_overall_risk_status(self, predictions):
         """Tentukan status risiko overall berdasarkan prediksi"""
@@ -79,6 +83,6 @@ class RealTimeDataController:
         else:
             return "RENDAH", "green"
 
-    def is_same_location(self, loc1, loc2):
-        """Check jika dua lokasi sama (simple matching)"""
-        return True  # Untuk testing, anggap semua lokasi match
\ No newline at end of file
+    def is_same_location(self, water_location, rainfall_location):
+        """Check jika pos hujan terhubung ke pos TMA (terdekat/hulu) menurut registry stasiun"""
+        return self.station_registry.is_joined(water_location, rainfall_location)
\ No newline at end of file
@@ -0,0 +1,152 @@
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+STATION_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'station_registry.json')
+
+EARTH_RADIUS_KM = 6371.0
+
+def nearest_points(points, targets):
+    """(jarak, index) target terdekat untuk setiap titik; brute force satu matriks jarak (n_points x n_targets)"""
+    distances = np.linalg.norm(points[:, None, :] - targets[None, :, :], axis=2)
+    nearest = distances.argmin(axis=1)
+    return distances[np.arange(len(points)), nearest], nearest
+
+def normalize_station_name(name):
+    """Kunci lookup nama pos: huruf kecil, tanpa keterangan dalam kurung, spasi dirapikan"""
+    name = re.sub(r'\(.*?\)', ' ', str(name or '')).lower()
+    return ' '.join(name.split())
+
+class StationRegistry:
+    """
+    Registry pos TMA dan pos hujan (koordinat + alias nama) dari station_registry.json.
+
+    Saat load, setiap pos hujan dipetakan ke pos TMA terdekat (matriks jarak NumPy, dihitung sekali),
+    atau ke pos TMA hilir yang ditulis eksplisit di `water_level_station` (pos hujan di hulu
+    anak sungai). Pos TMA yang tidak kebagian pos hujan mendapat pos hujan terdekatnya.
+    Hasil join disimpan, jadi tiap siklus prediksi hanya melakukan lookup dict nama -> id.
+    """
+
+    def __init__(self, path=STATION_REGISTRY_PATH):
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as f:
+            registry = json.load(f)
+
+        self.water_stations = registry['water_level_stations']
+        self.rainfall_stations = registry['rainfall_stations']
+        self.water_index = self._build_alias_index(self.water_stations)
+        self.rainfall_index = self._build_alias_index(self.rainfall_stations)
+
+        # Proyeksi equirectangular ke km di sekitar lintang tengah DAS: cukup akurat untuk
+        # jarak puluhan km dan membuat jarak Euclidean setara jarak permukaan
+        all_stations = self.water_stations + self.rainfall_stations
+        self.reference_lat = float(np.mean([s['lat'] for s in all_stations]))
+        self.water_xy = self.project([s['lat'] for s in self.water_stations], [s['lon'] for s in self.water_stations])
+        self.rainfall_xy = self.project([s['lat'] for s in self.rainfall_stations],
+                                        [s['lon'] for s in self.rainfall_stations])
+
+        self._build_joins()
+
+    def _build_alias_index(self, stations):
+        index = {}
+        for position, station in enumerate(stations):
+            for name in [station['id'], station['name']] + station.get('aliases', []):
+                index.setdefault(normalize_station_name(name), position)
+        return index
+
+    def project(self, lat, lon):
+        """(lat, lon) derajat -> koordinat (x, y) km"""
+        lat = np.radians(np.asarray(lat, dtype=float))
+        lon = np.radians(np.asarray(lon, dtype=float))
+        x = EARTH_RADIUS_KM * lon * np.cos(np.radians(self.reference_lat))
+        y = EARTH_RADIUS_KM * lat
+        return np.column_stack([x, y])
+
+    def _build_joins(self):
+        water_positions = {station['id']: position for position, station in enumerate(self.water_stations)}
+
+        distance, nearest = nearest_points(self.rainfall_xy, self.water_xy)
+        self.rainfall_to_water = nearest
+        self.rainfall_to_water_km = distance
+        for position, station in enumerate(self.rainfall_stations):
+            downstream = station.get('water_level_station')
+            if downstream:
+                self.rainfall_to_water[position] = water_positions[downstream]
+                self.rainfall_to_water_km[position] = float(np.linalg.norm(
+                    self.rainfall_xy[position] - self.water_xy[water_positions[downstream]]))
+
+        # Pos hujan per pos TMA: yang dipetakan ke pos itu + pos hujan terdekatnya sendiri
+        _, nearest_gauge = nearest_points(self.water_xy, self.rainfall_xy)
+        self.water_to_rainfall = [[] for _ in self.water_stations]
+        for rainfall_position, water_position in enumerate(self.rainfall_to_water):
+            self.water_to_rainfall[water_position].append(rainfall_position)
+        for water_position, gauges in enumerate(self.water_to_rainfall):
+            if int(nearest_gauge[water_position]) not in gauges:
+                gauges.append(int(nearest_gauge[water_position]))
+
+    def resolve_water_station(self, name):
+        """Posisi pos TMA untuk nama/alias dari BBWS, atau None"""
+        return self.water_index.get(normalize_station_name(name))
+
+    def resolve_rainfall_station(self, name):
+        """Posisi pos hujan untuk nama/alias dari BBWS, atau None"""
+        return self.rainfall_index.get(normalize_station_name(name))
+
+    def nearest_water_station(self, lat, lon):
+        """Pos TMA terdekat dari suatu koordinat: (station, jarak_km)"""
+        distance, nearest = nearest_points(self.project([lat], [lon]), self.water_xy)
+        return self.water_stations[int(nearest[0])], float(distance[0])
+
+    def get_rainfall_station_water_station(self, name):
+        """Pos TMA tujuan join untuk satu pos hujan, atau None jika nama tidak dikenal"""
+        position = self.resolve_rainfall_station(name)
+        if position is None:
+            return None
+        return self.water_stations[self.rainfall_to_water[position]]
+
+    def is_joined(self, water_name, rainfall_name):
+        """True jika pos hujan termasuk pos hujan yang dipakai untuk pos TMA tersebut"""
+        water_position = self.resolve_water_station(water_name)
+        rainfall_position = self.resolve_rainfall_station(rainfall_name)
+        if water_position is None or rainfall_position is None:
+            return False
+        return rainfall_position in self.water_to_rainfall[water_position]
+
+    def match_rainfall(self, water_levels, rainfall):
+        """
+        Index record rainfall untuk setiap record TMA (-1 jika tidak ada).
+        Jika beberapa pos hujan terhubung ke satu pos TMA, dipilih yang curah hujannya tertinggi.
+        """
+        reading_by_gauge = {}
+        for index, reading in enumerate(rainfall):
+            position = self.resolve_rainfall_station(reading['location'])
+            if position is None:
+                continue
+            current = reading_by_gauge.get(position)
+            if current is None or reading['rainfall_mm'] > rainfall[current]['rainfall_mm']:
+                reading_by_gauge[position] = index
+
+        matches = []
+        for water in water_levels:
+            water_position = self.resolve_water_station(water['location'])
+            candidates = [] if water_position is None else [
+                reading_by_gauge[gauge] for gauge in self.water_to_rainfall[water_position] if gauge in reading_by_gauge
+            ]
+            matches.append(max(candidates, key=lambda index: rainfall[index]['rainfall_mm']) if candidates else -1)
+        return matches
+
+# Registry dibaca sekali per proses
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_station_registry(path=STATION_REGISTRY_PATH):
+    """Registry stasiun bersama untuk proses ini (join dihitung sekali saat load)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = StationRegistry(path)
+        return _registry
@@ -0,0 +1,110 @@
+import hashlib
+import io
+
+from lxml import etree
+
+def _cell_text(element):
+    """Teks sel seperti BeautifulSoup get_text(strip=True): setiap node di-strip lalu digabung"""
+    return ''.join(text.strip() for text in element.itertext())
+
+def map_columns(headers, column_spec):
+    """Index kolom tabel untuk setiap field berdasarkan kata kunci di teks header"""
+    headers = [header.strip().lower() for header in headers]
+    mapping = {}
+    for field, keywords in column_spec:
+        for keyword in keywords:
+            index = next((i for i, header in enumerate(headers)
+                          if keyword in header and i not in mapping.values()), None)
+            if index is not None:
+                mapping[field] = index
+                break
+    return mapping
+
+def iter_station_rows(html, column_spec):
+    """
+    Stream baris tabel stasiun pertama yang header-nya cocok dengan column_spec.
+    Memakai lxml iterparse (event 'end' untuk th/td/tr/table saja) dan membuang elemen
+    yang sudah dibaca, jadi tidak ada pohon DOM penuh yang dibangun. Yield (cells, mapping).
+    """
+    data = html.encode('utf-8') if isinstance(html, str) else html
+    headers, cells, mapping = [], [], None
+
+    events = etree.iterparse(io.BytesIO(data), events=('end',), tag=('th', 'td', 'tr', 'table'),
+                             html=True, recover=True, encoding='utf-8')
+    for _, element in events:
+        tag = element.tag
+        if tag == 'td':
+            cells.append(_cell_text(element))
+        elif tag == 'th':
+            headers.append(_cell_text(element))
+        elif tag == 'tr':
+            if cells and mapping and len(cells) > max(mapping.values()):
+                yield cells, mapping
+            elif headers and not cells and mapping is None:
+                candidate = map_columns(headers, column_spec)
+                if 'location' in candidate and len(candidate) >= 2:
+                    mapping = candidate
+            cells = []
+            # Baris yang sudah diproses tidak dibutuhkan lagi
+            element.clear()
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+        elif tag == 'table':
+            if mapping is not None:
+                return
+            headers = []
+            element.clear()
+
+def parse_station_rows(html, column_spec):
+    """Baris tabel stasiun -> list dict field mentah (sama dengan hasil parse BeautifulSoup)"""
+    return [{field: cells[index] for field, index in mapping.items()}
+            for cells, mapping in iter_station_rows(html, column_spec)]
+
+def row_digest(row):
+    """Hash isi satu baris (8 byte blake2b) untuk deteksi perubahan"""
+    payload = '\x1f'.join(f"{field}={row[field]}" for field in sorted(row))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).digest()
+
+class StationChangeTracker:
+    """
+    Simpan hash baris terakhir per (jenis tabel, lokasi) dan teruskan hanya baris yang berubah.
+    Listener (callable(kind, rows)) dipanggil dengan baris yang berubah saja.
+    """
+
+    def __init__(self):
+        self._digests = {}  # (kind, location) -> digest
+        self._baselines = set()  # jenis tabel yang sudah pernah di-diff
+        self._listeners = []
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def diff(self, kind, rows):
+        """Return baris yang baru/berubah sejak poll sebelumnya (dan beri tahu listener)"""
+        self._baselines.add(kind)
+        changed = []
+        for row in rows:
+            key = (kind, row.get('location'))
+            digest = row_digest(row)
+            if self._digests.get(key) != digest:
+                self._digests[key] = digest
+                changed.append(row)
+        if changed:
+            for listener in self._listeners:
+                listener(kind, changed)
+        return changed
+
+    def has_baseline(self, kind):
+        """True jika tabel jenis ini sudah pernah di-diff (ada state pembanding)"""
+        return kind in self._baselines
+
+    def reset(self, kind=None):
+        """Lupakan hash (semua atau satu jenis tabel) agar poll berikutnya emit semua baris"""
+        if kind is None:
+            self._digests.clear()
+            self._baselines.clear()
+        else:
+            self._baselines.discard(kind)
+            for key in [k for k in self._digests if k[0] == kind]:
+                del self._digests[key]
@@ -1,43 +1,56 @@
 from models.VisitorModel import VisitorModel
+from models.VisitWriter import get_visit_writer
+from query_cache import cached_query, get_query_cache, skip_cache
+
+VISITOR_CACHE_NAMESPACE = 'visitor_stats'
 
 class VisitorController:
     def __init__(self):
         self.visitor_model = VisitorModel()
+        self.visit_writer = get_visit_writer(self.visitor_model)
 
     def track_visit(self, page_title=''):
-        """Track page visit"""
+        """Track page visit (ditulis async oleh VisitWriter, render tidak menunggu disk)"""
         try:
             # Get current page URL
             import streamlit as st
             page_url = st.experimental_get_query_params()
             page_url_str = str(page_url)
             
-            # Record visit
-            self.visitor_model.record_visit(page_url_str)
-            
-            # Update popular pages if page title provided
-            if page_title:
-                self.visitor_model.update_popular_page(page_url_str, page_title)
-                
-            return True
+            # Record visit + popular page (jika page_title ada) di batch berikutnya
+            event = self.visitor_model.build_visit_event(page_url_str, page_title)
+            self.visitor_model.mark_online(event[0])
+            return self.visit_writer.enqueue(event)
         except Exception as e:
             print(f"Tracking error: {e}")
             return False
 
-    def get_visitor_stats(self):
-        """Get all visitor statistics"""
+    @cached_query(VISITOR_CACHE_NAMESPACE, ttl=10)
+    def get_visitor_stats(self, mode='exact'):
+        """Get all visitor statistics (mode='approximate': unique bulanan dari sketch HyperLogLog)"""
         try:
+            approximate = mode == 'approximate'
             return {
                 'today': self.visitor_model.get_today_visitors(),
-                'month': self.visitor_model.get_month_visitors(),
+                'month': self.visitor_model.get_month_visitors(approximate=approximate),
                 'online': self.visitor_model.get_online_visitors(),
                 'popular_pages': self.visitor_model.get_today_popular_pages()
             }
         except Exception as e:
             print(f"Error getting stats: {e}")
+            skip_cache()
             return {
                 'today': 0,
                 'month': 0,
                 'online': 0,
                 'popular_pages': []
-            }
\ No newline at end of file
+            }
+
+    @cached_query(VISITOR_CACHE_NAMESPACE, ttl=300)
+    def get_unique_visitors(self, start_date=None, end_date=None, mode='approximate'):
+        """Unique visitors untuk range tanggal / semua waktu (mode 'exact' atau 'approximate')"""
+        return self.visitor_model.get_unique_visitors(start_date, end_date, approximate=(mode == 'approximate'))
+
+    def get_cache_stats(self):
+        """Hit/miss counter query cache (semua namespace)"""
+        return get_query_cache().stats()
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Stand-in lokal untuk hidrologi.bbws-bsolo.net: menyajikan halaman HTML rekaman di fixtures/bbws
+(/tma -> tma.html, /ch -> ch.html) lengkap dengan ETag/Last-Modified dan respons 304.
+
+Usage: python fixtures/bbws_server.py [--port 8765] [--delay-ms 0]
+       BBWS_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+--delay-ms mensimulasikan latensi upstream per request (untuk melihat bahwa fetch paralel
+hanya butuh satu round-trip).
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bbws')
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive: klien bisa memakai ulang koneksi
+    fixtures_dir = FIXTURES_DIR
+    delay = 0.0
+
+    def _fixture_path(self):
+        name = self.path.split('?', 1)[0].strip('/') or 'index'
+        path = os.path.join(self.fixtures_dir, f"{name.replace('/', '_')}.html")
+        return path if os.path.isfile(path) else None
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+
+        path = self._fixture_path()
+        if path is None:
+            self._send(404, b'not found')
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        mtime = int(os.path.getmtime(path))
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        headers = {'ETag': etag, 'Last-Modified': formatdate(mtime, usegmt=True)}
+
+        if self._not_modified(etag, mtime):
+            self._send(304, b'', headers)
+        else:
+            self._send(200, body, headers)
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')]
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port=0, delay_ms=0, fixtures_dir=FIXTURES_DIR):
+    """Jalankan stand-in di thread background; return (server, base_url). Stop dengan server.shutdown()"""
+    handler = type('Handler', (FixtureHandler,), {'delay': delay_ms / 1000.0, 'fixtures_dir': fixtures_dir})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='bbws-standin', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in lokal BBWS Bengawan Solo")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay-ms', type=int, default=0)
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.delay_ms)
+    print(f"🌊 BBWS stand-in di {base_url} (fixtures: {FIXTURES_DIR})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,15 @@
 import numpy as np
 import math
+import hashlib
 
-def predict_flood_gumbel(rainfall, return_period=10):
+EULER_GAMMA = 0.5772156649015329
+
+def predict_flood_gumbel(rainfall, return_period=10, mu=85.0, beta=22.5):
     """
     Prediksi menggunakan distribusi Gumbel untuk extreme value analysis
+    mu/beta default = parameter historis, bisa diganti hasil fit_gumbel_parameters per stasiun
     """
     try:
-        # Parameter Gumbel berdasarkan data historis
-        mu = 85.0   # location parameter
-        beta = 22.5 # scale parameter
-        
         # Hitung probability menggunakan CDF Gumbel
         z = (rainfall - mu) / beta
         probability = math.exp(-math.exp(-z))
@@ -17,10 +17,12 @@ def predict_flood_gumbel(rainfall, return_period=10):
         # Risk level berdasarkan probability
         risk_level = min(1.0, probability * 1.5)
         
-        # Tentukan status
-        if risk_level >= 0.7:
+        # Tentukan status (threshold dari model artifact)
+        from model_store import get_status_thresholds
+        thresholds = get_status_thresholds()
+        if risk_level >= thresholds['gumbel_high']:
             status = "TINGGI"
-        elif risk_level >= 0.4:
+        elif risk_level >= thresholds['gumbel_medium']:
             status = "MENENGAH"
         else:
             status = "RENDAH"
@@ -31,7 +33,8 @@ def predict_flood_gumbel(rainfall, return_period=10):
             'parameters_used': {
                 'mu_location': mu,
                 'beta_scale': beta,
-                'return_period': return_period
+                'return_period': return_period,
+                'return_level': round(float(gumbel_return_level(return_period, mu, beta)), 2)
             },
             'message': f'Distribusi Gumbel: Prob {probability:.1%}',
             'status': status
@@ -44,12 +47,207 @@ def predict_flood_gumbel(rainfall, return_period=10):
             'message': f'Error: {str(e)}',
             'status': 'ERROR'
         }
-def get_gumbel_parameters():
-    """Return parameter Gumbel untuk display di technical details"""
+
+# Kode status untuk hasil batch (index = kode)
+GUMBEL_STATUS_LABELS = np.array(['RENDAH', 'MENENGAH', 'TINGGI'])
+
+def _gumbel_reduced_exp(x, mu, beta):
+    """exp(-(x - mu) / beta); x, mu, beta saling di-broadcast (skalar x + array mu juga valid)"""
+    z = np.asarray(np.divide(np.subtract(x, mu, dtype=float), beta))
+    np.negative(z, out=z)
+    np.exp(z, out=z)
+    return z
+
+def gumbel_cdf(x, mu=85.0, beta=22.5):
+    """CDF Gumbel F(x) = exp(-exp(-(x - mu) / beta)) untuk array/grid sembarang"""
+    z = _gumbel_reduced_exp(x, mu, beta)
+    np.negative(z, out=z)
+    np.exp(z, out=z)
+    return z
+
+def gumbel_exceedance_probability(x, mu=85.0, beta=22.5):
+    """
+    Probabilitas terlampaui P(X > x) = 1 - F(x) = -expm1(-exp(-(x - mu) / beta)).
+    expm1 menjaga presisi di ekor atas, di mana 1 - F(x) langsung jadi 0.
+    """
+    z = _gumbel_reduced_exp(x, mu, beta)
+    np.negative(z, out=z)
+    np.expm1(z, out=z)
+    np.negative(z, out=z)
+    return z
+
+def gumbel_return_level(return_period, mu=85.0, beta=22.5):
+    """Curah hujan rencana untuk periode ulang T tahun: x_T = mu - beta * ln(-ln(1 - 1/T))"""
+    return_period = np.asarray(return_period, dtype=float)
+    return mu - beta * np.log(-np.log(1.0 - 1.0 / return_period))
+
+def gumbel_return_period(x, mu=85.0, beta=22.5):
+    """Periode ulang (tahun) dari nilai curah hujan: T = 1 / (1 - F(x))"""
+    with np.errstate(divide='ignore'):
+        return 1.0 / gumbel_exceedance_probability(x, mu, beta)
+
+def predict_flood_gumbel_batch(rainfall, return_period=10, mu=85.0, beta=22.5):
+    """
+    Versi array dari predict_flood_gumbel untuk seluruh seri/grid curah hujan.
+    Hasil risk_level dan probability identik dengan versi skalar per elemen.
+    """
+    probability = gumbel_cdf(rainfall, mu, beta)
+    
+    # Risk level = min(1, 1.5 * probability); asarray agar input skalar/0-d tetap bisa in-place
+    risk_level = np.asarray(np.multiply(probability, 1.5))
+    np.minimum(risk_level, 1.0, out=risk_level)
+    
+    # Kode status: 0 = RENDAH, 1 = MENENGAH, 2 = TINGGI
+    from model_store import get_status_thresholds
+    thresholds = get_status_thresholds()
+    status_code = (risk_level >= thresholds['gumbel_medium']).astype(np.int8)
+    status_code += risk_level >= thresholds['gumbel_high']
+    
+    return_level = gumbel_return_level(return_period, mu, beta)
+    
     return {
+        'risk_level': np.round(risk_level, 3),
+        'probability': np.round(probability, 4),
+        'status_code': status_code,
+        'status': GUMBEL_STATUS_LABELS[status_code],
+        'return_level': return_level,
+        'exceeds_return_level': np.asarray(rainfall) >= return_level
+    }
+
+# Cache hasil fitting: (fingerprint, method) -> parameter
+_GUMBEL_FIT_CACHE = {}
+_GUMBEL_FIT_CACHE_MAXSIZE = 4096
+
+def gumbel_fit_fingerprint(annual_maxima):
+    """Fingerprint dataset annual maxima (tidak bergantung urutan data)"""
+    data = np.sort(np.asarray(annual_maxima, dtype=np.float64).ravel())
+    return hashlib.sha1(data.tobytes()).hexdigest()
+
+def fit_gumbel_moments(annual_maxima):
+    """Estimasi mu/beta dengan method of moments"""
+    data = np.asarray(annual_maxima, dtype=float)
+    beta = math.sqrt(6.0) * data.std(ddof=1) / math.pi
+    mu = data.mean() - EULER_GAMMA * beta
+    return float(mu), float(beta)
+
+def fit_gumbel_lmoments(annual_maxima):
+    """Estimasi mu/beta dengan L-moments (lebih robust untuk sampel kecil)"""
+    data = np.sort(np.asarray(annual_maxima, dtype=float))
+    n = data.size
+    b0 = data.mean()
+    b1 = np.dot(np.arange(n) / (n - 1), data) / n
+    l2 = 2 * b1 - b0
+    beta = l2 / math.log(2)
+    mu = b0 - EULER_GAMMA * beta
+    return float(mu), float(beta)
+
+def fit_gumbel_mle(annual_maxima, tol=1e-8, max_iter=100):
+    """Estimasi mu/beta dengan maximum likelihood (Newton-Raphson pada beta)"""
+    data = np.asarray(annual_maxima, dtype=float)
+    # Geser ke mean agar exp(-x/beta) stabil secara numerik
+    mean = data.mean()
+    x = data - mean
+    
+    _, beta = fit_gumbel_moments(data)
+    for _ in range(max_iter):
+        w = np.exp(-x / beta)
+        s0 = w.sum()
+        s1 = np.dot(x, w)
+        s2 = np.dot(x * x, w)
+        # g(beta) = beta - mean(x) + s1/s0 = 0 (mean(x) = 0 setelah digeser)
+        g = beta + s1 / s0
+        dg = 1 + (s2 * s0 - s1 * s1) / (s0 * s0 * beta * beta)
+        step = g / dg
+        beta -= step
+        if beta <= 0:
+            raise ValueError("MLE Gumbel tidak konvergen")
+        if abs(step) < tol * beta:
+            break
+    
+    mu = mean - beta * math.log(np.mean(np.exp(-x / beta)))
+    return float(mu), float(beta)
+
+GUMBEL_FIT_METHODS = {
+    'moments': fit_gumbel_moments,
+    'lmoments': fit_gumbel_lmoments,
+    'mle': fit_gumbel_mle
+}
+
+def fit_gumbel_parameters(annual_maxima, method='lmoments'):
+    """
+    Fit parameter Gumbel dari data curah hujan maksimum tahunan.
+    Hasil di-memoize berdasarkan fingerprint dataset, jadi hanya dihitung ulang
+    jika ada data maksimum baru.
+    """
+    if method not in GUMBEL_FIT_METHODS:
+        raise ValueError(f"Metode fitting tidak dikenal: {method}")
+    
+    data = np.asarray(annual_maxima, dtype=float).ravel()
+    if data.size < 2:
+        raise ValueError("Minimal 2 data maksimum tahunan untuk fitting Gumbel")
+    if not np.isfinite(data).all():
+        raise ValueError("Data maksimum tahunan mengandung NaN/inf, bersihkan data sebelum fitting Gumbel")
+    if not np.ptp(data) > 0:
+        # Variansi nol -> beta = 0, semua probabilitas jadi inf/NaN
+        raise ValueError("Data maksimum tahunan konstan, parameter Gumbel tidak terdefinisi")
+    
+    fingerprint = gumbel_fit_fingerprint(data)
+    key = (fingerprint, method)
+    cached = _GUMBEL_FIT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    mu, beta = GUMBEL_FIT_METHODS[method](data)
+    if not (math.isfinite(mu) and math.isfinite(beta) and beta > 0):
+        raise ValueError(f"Fitting Gumbel menghasilkan parameter tidak valid (mu={mu}, beta={beta})")
+    result = {
+        'mu_location': round(mu, 4),
+        'beta_scale': round(beta, 4),
+        'method': method,
+        'n_years': int(data.size),
+        'fingerprint': fingerprint
+    }
+    
+    if len(_GUMBEL_FIT_CACHE) >= _GUMBEL_FIT_CACHE_MAXSIZE:
+        _GUMBEL_FIT_CACHE.clear()
+    _GUMBEL_FIT_CACHE[key] = result
+    return result
+
+def get_station_gumbel_parameters(station):
+    """(mu, beta) stasiun dari model artifact aktif; default historis jika belum di-fit"""
+    from model_store import get_current_artifact
+    artifact = get_current_artifact()
+    if artifact is not None and station in artifact.gumbel_fits:
+        return artifact.gumbel_fits[station]
+    return 85.0, 22.5
+
+def get_station_gumbel_parameter_arrays(stations):
+    """
+    Array (mu, beta) sejajar dengan daftar pos hujan (kunci fit = nama pos hujan), untuk
+    predict_flood_gumbel_batch. Nama None / belum di-fit memakai parameter default.
+    """
+    from model_store import get_current_artifact
+    artifact = get_current_artifact()
+    fits = artifact.gumbel_fits if artifact is not None else {}
+    params = np.array([fits.get(station, (85.0, 22.5)) for station in stations], dtype=float).reshape(-1, 2)
+    return params[:, 0], params[:, 1]
+
+def get_gumbel_parameters(fit=None):
+    """Return parameter Gumbel untuk display di technical details"""
+    params = {
         'mu_location': 85.0,
         'beta_scale': 22.5,
         'distribution_type': 'Gumbel Type I (Extreme Value Type I)',
         'data_source': 'BMKG Historical Data 10 years',
         'application': 'Extreme flood prediction'
-    }
\ No newline at end of file
+    }
+    
+    # Gunakan hasil fitting per stasiun jika tersedia
+    if fit:
+        params.update({
+            'mu_location': fit['mu_location'],
+            'beta_scale': fit['beta_scale'],
+            'data_source': f"Annual maxima {fit['n_years']} tahun ({fit['method']})"
+        })
+    
+    return params
\ No newline at end of file
@@ -1,4 +1,117 @@
 import numpy as np
+import os
+import threading
+
+# Bobot MLP hasil training offline (train_ann.py)
+ANN_WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ann_weights.npz')
+
+# Normalisasi fitur (rainfall, water_level, humidity, temperature) untuk model linear
+# dan default training; MLP terlatih membawa faktor normalisasinya sendiri
+NORMALIZATION_FACTORS = np.array([300.0, 150.0, 100.0, 35.0])
+
+class NumpyMLP:
+    """
+    Inference MLP (mis. 4-8-4-1) murni NumPy dari bobot hasil export scikit-learn.
+    Buffer antar-layer dialokasikan sekali per ukuran batch (per thread) lalu dipakai ulang.
+    """
+    
+    def __init__(self, coefs, intercepts, normalization_factors, metadata=None):
+        self.coefs = [np.ascontiguousarray(c, dtype=np.float64) for c in coefs]
+        self.intercepts = [np.ascontiguousarray(b, dtype=np.float64) for b in intercepts]
+        self.normalization_factors = np.asarray(normalization_factors, dtype=np.float64)
+        self.metadata = metadata or {}
+        self._local = threading.local()
+    
+    @classmethod
+    def load(cls, path):
+        """Load bobot dari file .npz hasil export train_ann.py"""
+        with np.load(path, allow_pickle=False) as data:
+            n_layers = int(data['n_layers'])
+            coefs = [data[f'coef_{i}'] for i in range(n_layers)]
+            intercepts = [data[f'intercept_{i}'] for i in range(n_layers)]
+            metadata = {
+                'training_samples': int(data['training_samples']),
+                'accuracy': float(data['accuracy'])
+            }
+            return cls(coefs, intercepts, data['normalization_factors'], metadata)
+    
+    @property
+    def layer_sizes(self):
+        return [self.coefs[0].shape[0]] + [c.shape[1] for c in self.coefs]
+    
+    @property
+    def architecture(self):
+        return '-'.join(str(size) for size in self.layer_sizes)
+    
+    def _get_buffers(self, n):
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None or buffers[0].shape[0] != n:
+            buffers = [np.empty((n, c.shape[1])) for c in self.coefs]
+            self._local.buffers = buffers
+        return buffers
+    
+    def predict_normalized(self, normalized_features):
+        """Probabilitas banjir (N,) dari fitur yang sudah dinormalisasi (N x 4)"""
+        activation = np.asarray(normalized_features, dtype=np.float64)
+        for coef, intercept, buffer in zip(self.coefs, self.intercepts,
+                                           self._get_buffers(activation.shape[0])):
+            np.matmul(activation, coef, out=buffer)
+            buffer += intercept
+            # Sigmoid in-place (hidden dan output layer)
+            np.negative(buffer, out=buffer)
+            np.exp(buffer, out=buffer)
+            buffer += 1.0
+            np.reciprocal(buffer, out=buffer)
+            activation = buffer
+        return activation[:, 0].copy()
+    
+    def predict(self, features):
+        """Probabilitas banjir (N,) dari fitur mentah (N x 4)"""
+        return self.predict_normalized(np.asarray(features, dtype=np.float64) / self.normalization_factors)
+
+_mlp_model = None
+_mlp_loaded = False
+_mlp_lock = threading.Lock()
+
+def get_mlp_model():
+    """
+    MLP terlatih: dari model artifact store (versi terbaru, hot reload) jika ada,
+    jika tidak dari ANN_WEIGHTS_PATH (load sekali per proses). None jika belum ada bobot.
+    """
+    global _mlp_model, _mlp_loaded
+    from model_store import get_current_artifact
+    artifact = get_current_artifact()
+    if artifact is not None and artifact.mlp is not None:
+        return artifact.mlp
+    
+    if not _mlp_loaded:
+        with _mlp_lock:
+            if not _mlp_loaded:
+                if os.path.exists(ANN_WEIGHTS_PATH):
+                    try:
+                        _mlp_model = NumpyMLP.load(ANN_WEIGHTS_PATH)
+                    except Exception as e:
+                        print(f"❌ Error loading ANN weights: {e}")
+                _mlp_loaded = True
+    return _mlp_model
+
+def get_normalization_factors():
+    """Faktor normalisasi yang sedang dipakai inference (milik MLP terlatih jika ada)"""
+    mlp = get_mlp_model()
+    return NORMALIZATION_FACTORS if mlp is None else mlp.normalization_factors
+
+def _base_risk(features, weights):
+    """
+    Risk dasar dari fitur mentah (N x 4) sebelum threshold adjustment: MLP terlatih jika ada
+    (dinormalisasi dengan faktor milik MLP), jika tidak weighted sum + sigmoid
+    """
+    mlp = get_mlp_model()
+    if mlp is not None:
+        return mlp.predict(features)
+    
+    normalized_features = features / NORMALIZATION_FACTORS
+    weighted_sum = np.sum(normalized_features * weights, axis=1)
+    return 1 / (1 + np.exp(-weighted_sum * 6))  # Reduced from 10 to 6
 
 def predict_flood_ann(rainfall, water_level, humidity, temperature):
     """
@@ -17,17 +130,8 @@ def predict_flood_ann(rainfall, water_level, humidity, temperature):
         # Bobot parameter yang diperbaiki - rainfall lebih dominan
         weights = np.array([0.50, 0.25, 0.15, 0.10])  # Rainfall lebih berpengaruh
         
-        # Normalization factors 
-        normalization_factors = np.array([300.0, 150.0, 100.0, 35.0])
-        
-        # Normalisasi fitur
-        normalized_features = features / normalization_factors
-        
-        # Hitung risk score dengan weighted sum - multiplier yang lebih reasonable
-        weighted_sum = np.sum(normalized_features * weights, axis=1)[0]
-        
-        # Aktivasi sigmoid dengan multiplier yang lebih kecil
-        risk_level = 1 / (1 + np.exp(-weighted_sum * 6))  # Reduced from 10 to 6
+        # Hitung risk score (MLP terlatih, atau weighted sum + sigmoid)
+        risk_level = _base_risk(features, weights)[0]
         
         # Threshold adjustment yang lebih realistis
         if rainfall > 200:  # Hujan sangat lebat
@@ -41,14 +145,15 @@ def predict_flood_ann(rainfall, water_level, humidity, temperature):
             risk_level = min(1.0, risk_level * 1.1)
         
         # Baseline adjustment - kondisi normal harus punya risk rendah
-        baseline_risk = 0.1
-        risk_level = max(baseline_risk, risk_level)  # Minimum risk
+        from model_store import get_status_thresholds
+        thresholds = get_status_thresholds()
+        risk_level = max(thresholds['ann_baseline'], risk_level)  # Minimum risk
         
-        # Tentukan status dengan threshold yang lebih ketat
-        if risk_level >= 0.8:
+        # Tentukan status dengan threshold yang lebih ketat (dari model artifact)
+        if risk_level >= thresholds['ann_high']:
             status = "TINGGI"
             message = "Waspada! Kondisi kritis - potensi banjir tinggi"
-        elif risk_level >= 0.5:
+        elif risk_level >= thresholds['ann_medium']:
             status = "MENENGAH" 
             message = "Siaga! Pantau terus perkembangan"
         else:
@@ -61,7 +166,7 @@ def predict_flood_ann(rainfall, water_level, humidity, temperature):
             'message': f'Prediksi ANN: {message}',
             'parameters_used': {
                 'weights': weights.tolist(),
-                'normalization_factors': normalization_factors.tolist(),
+                'normalization_factors': get_normalization_factors().tolist(),
                 'input_values': {
                     'rainfall': rainfall,
                     'water_level': water_level,
@@ -78,17 +183,103 @@ def predict_flood_ann(rainfall, water_level, humidity, temperature):
             'message': f'Error dalam prediksi ANN: {str(e)}'
         }
 
+# Kode status untuk hasil batch (index = kode)
+ANN_STATUS_LABELS = np.array(['RENDAH', 'MENENGAH', 'TINGGI'])
+ANN_STATUS_MESSAGES = np.array(['Prediksi ANN: Aman, tetap waspada',
+                                'Prediksi ANN: Siaga! Pantau terus perkembangan',
+                                'Prediksi ANN: Waspada! Kondisi kritis - potensi banjir tinggi'])
+
+def predict_flood_ann_batch(rainfall, water_level, humidity, temperature):
+    """
+    Versi batch dari predict_flood_ann untuk N pembacaan sekaligus.
+    Input berupa array/list/Series dengan panjang sama (atau skalar yang di-broadcast).
+    Hasil identik dengan predict_flood_ann per elemen.
+    """
+    rainfall = np.asarray(rainfall, dtype=float)
+    water_level = np.asarray(water_level, dtype=float)
+    humidity = np.asarray(humidity, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+    rainfall, water_level, humidity, temperature = np.broadcast_arrays(
+        rainfall, water_level, humidity, temperature
+    )
+    shape = rainfall.shape
+    
+    # Matriks fitur N x 4, sama seperti versi skalar (1 x 4)
+    features = np.column_stack([
+        rainfall.ravel(),
+        water_level.ravel(),
+        humidity.ravel(),
+        temperature.ravel()
+    ])
+    
+    weights = np.array([0.50, 0.25, 0.15, 0.10])
+    risk_level = _base_risk(features, weights)
+    
+    # Threshold adjustment dalam bentuk operasi array
+    rain = features[:, 0]
+    water = features[:, 1]
+    rain_boost = np.where(rain > 200, 1.4, np.where(rain > 100, 1.2, 1.0))
+    risk_level = np.minimum(1.0, risk_level * rain_boost)
+    water_boost = np.where(water > 130, 1.3, np.where(water > 110, 1.1, 1.0))
+    risk_level = np.minimum(1.0, risk_level * water_boost)
+    
+    # Baseline adjustment
+    from model_store import get_status_thresholds
+    thresholds = get_status_thresholds()
+    risk_level = np.maximum(thresholds['ann_baseline'], risk_level)
+    
+    # Kode status: 0 = RENDAH, 1 = MENENGAH, 2 = TINGGI
+    status_code = np.where(risk_level >= thresholds['ann_high'], 2,
+                           np.where(risk_level >= thresholds['ann_medium'], 1, 0))
+    
+    return {
+        'risk_level': np.round(risk_level, 3).reshape(shape),
+        'status_code': status_code.reshape(shape),
+        'status': ANN_STATUS_LABELS[status_code].reshape(shape)
+    }
+
+def predict_flood_ann_dataframe(df, rainfall_col='rainfall', water_level_col='water_level',
+                                humidity_col='humidity', temperature_col='temperature'):
+    """Jalankan predict_flood_ann_batch pada DataFrame, return copy dengan kolom hasil"""
+    result = predict_flood_ann_batch(
+        df[rainfall_col].to_numpy(),
+        df[water_level_col].to_numpy(),
+        df[humidity_col].to_numpy(),
+        df[temperature_col].to_numpy()
+    )
+    
+    output = df.copy()
+    output['ann_risk'] = result['risk_level']
+    output['ann_status_code'] = result['status_code']
+    output['ann_status'] = result['status']
+    return output
+
 def get_ann_parameters():
     """Return parameter ANN untuk display di technical details"""
-    return {
+    params = {
         'architecture': '4-8-4-1 Neural Network',
         'weights': [0.50, 0.25, 0.15, 0.10],  # Updated weights
-        'normalization_factors': [300.0, 150.0, 100.0, 35.0],
+        'normalization_factors': NORMALIZATION_FACTORS.tolist(),
         'activation': 'Sigmoid',
         'training_samples': 1245,
         'accuracy': 0.892,
         'version': '2.0 - Improved Logic'
     }
+    
+    # Jika MLP terlatih tersedia, tampilkan parameter aslinya (bobot linear di atas tidak dipakai)
+    mlp = get_mlp_model()
+    if mlp is not None:
+        del params['weights']
+        params.update({
+            'architecture': f'{mlp.architecture} Neural Network',
+            'layer_sizes': mlp.layer_sizes,
+            'normalization_factors': mlp.normalization_factors.tolist(),
+            'training_samples': mlp.metadata['training_samples'],
+            'accuracy': mlp.metadata['accuracy'],
+            'version': f"3.0 - Trained MLP ({mlp.metadata.get('version', 'npz')})"
+        })
+    
+    return params
 
 def predict_flood_ann_interactive(rainfall, water_level, humidity, temperature):
     """Versi interactive yang return lebih banyak detail untuk demo"""
@@ -96,12 +287,9 @@ def predict_flood_ann_interactive(rainfall, water_level, humidity, temperature):
     
     # Tambahkan detail tambahan
     result.update({
-        'normalized_features': [
-            rainfall / 300.0,
-            water_level / 150.0,
-            humidity / 100.0,
-            temperature / 35.0
-        ]
+        'normalized_features': (
+            np.array([rainfall, water_level, humidity, temperature]) / get_normalization_factors()
+        ).tolist()
     })
     
     return result
@@ -135,8 +323,7 @@ def predict_flood_ann_legacy(rainfall, water_level, humidity, temperature):
     try:
         features = np.array([[rainfall, water_level, humidity, temperature]])
         weights = np.array([0.45, 0.30, 0.15, 0.10])
-        normalization_factors = np.array([300.0, 150.0, 100.0, 35.0])
-        normalized_features = features / normalization_factors
+        normalized_features = features / NORMALIZATION_FACTORS
         weighted_sum = np.sum(normalized_features * weights, axis=1)[0]
         risk_level = 1 / (1 + np.exp(-weighted_sum * 10))
         
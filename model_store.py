@@ -0,0 +1,208 @@
+"""
+Versioned model artifact store.
+
+Layout:
+    model_artifacts/
+        <version>/
+            manifest.json            # ditulis terakhir, tanda versi lengkap (+ threshold status)
+            ann_coef_<i>.npy         # bobot MLP per layer
+            ann_intercept_<i>.npy
+            normalization_factors.npy
+            gumbel_stations.json     # urutan stasiun untuk gumbel_params.npy
+            gumbel_params.npy        # (n_stations, 2) = mu, beta
+
+Array dibuka lazy sebagai memory-map saat prediksi pertama. Versi baru yang muncul
+di disk dipasang dengan satu assignment referensi, jadi tidak perlu restart proses.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+import numpy as np
+
+MODEL_ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_artifacts')
+
+# Cut-off status ANN (risk >= high -> TINGGI, >= medium -> MENENGAH, minimal baseline)
+# dan Gumbel; artifact bisa menimpa sebagian lewat manifest
+DEFAULT_THRESHOLDS = {
+    'ann_high': 0.8,
+    'ann_medium': 0.5,
+    'ann_baseline': 0.1,
+    'gumbel_high': 0.7,
+    'gumbel_medium': 0.4
+}
+
+def version_sort_key(name):
+    """Urutan natural nama versi: 'v10' setelah 'v9', '10' setelah '2'"""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in re.split(r'(\d+)', name) if part]
+
+class ModelArtifact:
+    """Satu versi artifact (read-only) yang array-nya di-memory-map"""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = os.path.basename(path)
+
+        with open(os.path.join(path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **self.manifest.get('thresholds', {}))
+        self.normalization_factors = self._load_array('normalization_factors.npy')
+        self.mlp = self._load_mlp()
+        self.gumbel_fits = self._load_gumbel_fits()
+
+    def _load_array(self, name):
+        array_path = os.path.join(self.path, name)
+        if not os.path.exists(array_path):
+            return None
+        return np.load(array_path, mmap_mode='r')
+
+    def _load_mlp(self):
+        n_layers = self.manifest.get('ann_layers', 0)
+        if not n_layers:
+            return None
+
+        from model_ann import NORMALIZATION_FACTORS, NumpyMLP
+        coefs = [self._load_array(f'ann_coef_{i}.npy') for i in range(n_layers)]
+        intercepts = [self._load_array(f'ann_intercept_{i}.npy') for i in range(n_layers)]
+        metadata = {
+            'training_samples': self.manifest.get('training_samples', 0),
+            'accuracy': self.manifest.get('accuracy', 0.0),
+            'version': self.version
+        }
+        normalization_factors = self.normalization_factors
+        if normalization_factors is None:
+            normalization_factors = NORMALIZATION_FACTORS
+        return NumpyMLP(coefs, intercepts, normalization_factors, metadata)
+
+    def _load_gumbel_fits(self):
+        params = self._load_array('gumbel_params.npy')
+        if params is None:
+            return {}
+
+        with open(os.path.join(self.path, 'gumbel_stations.json')) as f:
+            stations = json.load(f)
+        return {station: (float(params[i, 0]), float(params[i, 1]))
+                for i, station in enumerate(stations)}
+
+class ModelArtifactStore:
+    """Akses artifact terbaru; cek versi baru di disk paling sering tiap check_interval detik"""
+
+    def __init__(self, root=MODEL_ARTIFACTS_DIR, check_interval=30.0):
+        self.root = root
+        self.check_interval = check_interval
+        self._current = None
+        self._last_check = None
+        self._lock = threading.Lock()
+
+    def latest_version(self):
+        """
+        Nama versi terbaru yang lengkap (punya manifest.json): urut waktu publish di manifest,
+        lalu urutan natural nama (untuk artifact lama tanpa published_ns)
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.root)
+                       if entry.is_dir() and not entry.name.startswith('.')]
+        except FileNotFoundError:
+            return None
+
+        versions = []
+        for entry in entries:
+            try:
+                with open(os.path.join(entry.path, 'manifest.json')) as f:
+                    published_ns = json.load(f).get('published_ns', 0)
+            except (OSError, ValueError):
+                continue
+            versions.append((published_ns, version_sort_key(entry.name), entry.name))
+        return max(versions)[2] if versions else None
+
+    def get(self):
+        """Artifact aktif (None jika belum ada); hot-swap jika ada versi lebih baru"""
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.check_interval:
+            return self._current
+
+        with self._lock:
+            if self._last_check is not None and now - self._last_check < self.check_interval:
+                return self._current
+
+            self._last_check = now
+            version = self.latest_version()
+            if version and (self._current is None or version != self._current.version):
+                try:
+                    artifact = ModelArtifact(os.path.join(self.root, version))
+                    self._current = artifact  # swap atomik
+                    print(f"✅ Model artifact {version} loaded")
+                except Exception as e:
+                    print(f"❌ Error loading model artifact {version}: {e}")
+            return self._current
+
+def publish_artifact(version, mlp_coefs=None, mlp_intercepts=None, normalization_factors=None,
+                     gumbel_fits=None, thresholds=None, training_samples=0, accuracy=0.0,
+                     root=MODEL_ARTIFACTS_DIR):
+    """
+    Tulis versi artifact baru. Semua file ditulis ke direktori sementara lalu di-rename,
+    jadi pembaca tidak pernah melihat versi setengah jadi.
+    """
+    os.makedirs(root, exist_ok=True)
+    final_path = os.path.join(root, version)
+    if os.path.exists(final_path):
+        raise ValueError(f"Versi artifact sudah ada: {version}")
+
+    tmp_path = os.path.join(root, f'.tmp-{version}-{os.getpid()}')
+    os.makedirs(tmp_path)
+    try:
+        manifest = {
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'published_ns': time.time_ns(),
+            'thresholds': dict(DEFAULT_THRESHOLDS, **(thresholds or {})),
+            'ann_layers': len(mlp_coefs) if mlp_coefs else 0,
+            'training_samples': int(training_samples),
+            'accuracy': float(accuracy)
+        }
+
+        for i, (coef, intercept) in enumerate(zip(mlp_coefs or [], mlp_intercepts or [])):
+            np.save(os.path.join(tmp_path, f'ann_coef_{i}.npy'), np.asarray(coef, dtype=np.float64))
+            np.save(os.path.join(tmp_path, f'ann_intercept_{i}.npy'), np.asarray(intercept, dtype=np.float64))
+
+        if normalization_factors is not None:
+            np.save(os.path.join(tmp_path, 'normalization_factors.npy'),
+                    np.asarray(normalization_factors, dtype=np.float64))
+
+        if gumbel_fits:
+            stations = sorted(gumbel_fits)
+            params = np.array([[gumbel_fits[s]['mu_location'], gumbel_fits[s]['beta_scale']]
+                               for s in stations], dtype=np.float64)
+            np.save(os.path.join(tmp_path, 'gumbel_params.npy'), params)
+            with open(os.path.join(tmp_path, 'gumbel_stations.json'), 'w') as f:
+                json.dump(stations, f)
+
+        # manifest terakhir: tanda versi lengkap
+        with open(os.path.join(tmp_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        os.rename(tmp_path, final_path)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    return final_path
+
+# Store bersama per proses (dipakai semua sesi Streamlit)
+_default_store = ModelArtifactStore()
+
+def get_artifact_store():
+    """Store artifact default per proses"""
+    return _default_store
+
+def get_current_artifact():
+    """Artifact aktif dari store default, atau None jika belum ada versi"""
+    return _default_store.get()
+
+def get_status_thresholds():
+    """Threshold status dari artifact aktif, atau DEFAULT_THRESHOLDS jika belum ada versi"""
+    artifact = _default_store.get()
+    return artifact.thresholds if artifact is not None else DEFAULT_THRESHOLDS
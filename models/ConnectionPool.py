@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+
+class PooledConnection(sqlite3.Connection):
+    """Koneksi SQLite yang close()-nya mengembalikan koneksi ke pool, bukan menutupnya"""
+
+    def close(self):
+        pool = getattr(self, '_pool', None)
+        if pool is None:
+            return super().close()
+        pool.release(self)
+
+    def really_close(self):
+        super().close()
+
+class ConnectionPool:
+    """
+    Pool koneksi SQLite per proses (dipakai bersama semua sesi Streamlit).
+    Koneksi dibuat sekali dengan WAL + synchronous=NORMAL dan statement cache,
+    lalu dipakai ulang sehingga open/close tidak ada lagi di jalur request.
+    """
+
+    def __init__(self, db_path, max_idle=8, cached_statements=256, timeout=10.0):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _create_connection(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,  # koneksi bisa berpindah thread lewat pool
+            cached_statements=self.cached_statements,
+            factory=PooledConnection
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn._pool = self
+        return conn
+
+    def get_connection(self):
+        """Ambil koneksi dari pool (atau buat baru jika pool kosong)"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._create_connection()
+
+    def release(self, conn):
+        """Kembalikan koneksi ke pool; transaksi yang belum di-commit di-rollback"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.really_close()
+            return
+
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.really_close()
+
+    def close_all(self):
+        """Tutup semua koneksi idle (mis. saat shutdown)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.really_close()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(db_path='flood_system.db'):
+    """Pool bersama per file database"""
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = ConnectionPool(db_path)
+                _pools[db_path] = pool
+    return pool
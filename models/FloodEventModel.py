@@ -0,0 +1,85 @@
+from models.ConnectionPool import get_connection_pool
+
+class FloodEventModel:
+    _initialized = False  # Flag untuk mencegah inisialisasi berulang
+
+    def __init__(self):
+        self.db_path = 'flood_system.db'
+        if not FloodEventModel._initialized:
+            self.init_database()
+            FloodEventModel._initialized = True
+
+    def init_database(self):
+        """Initialize database and tables for labelled flood events (data training ANN)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS flood_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    station TEXT,
+                    rainfall_mm REAL NOT NULL,
+                    water_level_mdpl REAL NOT NULL,
+                    humidity REAL NOT NULL,
+                    temperature REAL NOT NULL,
+                    flooded INTEGER NOT NULL,
+                    event_date DATE DEFAULT CURRENT_DATE,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_event_date ON flood_events(event_date)')
+
+            conn.commit()
+            conn.close()
+            print("✅ Database flood_events initialized successfully")
+        except Exception as e:
+            print(f"❌ Database initialization error: {e}")
+
+    def get_connection(self):
+        """Get pooled database connection (close() mengembalikan ke pool)"""
+        return get_connection_pool(self.db_path).get_connection()
+
+    def add_event(self, rainfall_mm, water_level_mdpl, humidity, temperature, flooded, station=None, event_date=None):
+        """Simpan satu kejadian berlabel (flooded = 1 jika terjadi banjir)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO flood_events (station, rainfall_mm, water_level_mdpl, humidity, temperature, flooded, event_date)
+                VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_DATE))
+            ''', (station, rainfall_mm, water_level_mdpl, humidity, temperature, int(bool(flooded)), event_date))
+
+            event_id = cursor.lastrowid
+            conn.commit()
+            conn.close()
+            return event_id
+        except Exception as e:
+            print(f"❌ Error adding flood event: {e}")
+            if 'conn' in locals():
+                conn.close()
+            return None
+
+    def get_labelled_events(self):
+        """Get semua kejadian berlabel sebagai (features, labels) untuk training"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT rainfall_mm, water_level_mdpl, humidity, temperature, flooded
+                FROM flood_events
+                ORDER BY id
+            ''')
+
+            rows = cursor.fetchall()
+            conn.close()
+
+            features = [row[:4] for row in rows]
+            labels = [row[4] for row in rows]
+            return features, labels
+        except Exception as e:
+            print(f"❌ Error getting labelled events: {e}")
+            return [], []
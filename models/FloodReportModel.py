@@ -1,9 +1,40 @@
-import sqlite3
+from models.ConnectionPool import get_connection_pool
+from query_cache import skip_cache
 import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+import pandas as pd
+
+REPORT_COLUMNS = ['id', 'address', 'flood_height', 'reporter_name', 'reporter_phone',
+                  'photo_path', 'ip_address', 'report_date', 'report_time', 'created_at', 'status',
+                  'thumbnail_path']
+
+# Urutan kategori ketinggian banjir (sama dengan pilihan di form laporan)
+FLOOD_HEIGHT_LEVELS = ["Setinggi mata kaki", "Setinggi betis", "Setinggi lutut", "Setinggi paha",
+                       "Setinggi pinggang", "Setinggi dada", "Setinggi leher", "Lebih dari leher"]
+
+# Status laporan (default kolom status di tabel flood_reports)
+REPORT_STATUSES = ['pending']
+
+# dtype per kolom untuk reports_to_dataframe, juga saat hasil query kosong
+REPORT_DTYPES = {
+    'id': 'int64',
+    'address': object,
+    'flood_height': pd.CategoricalDtype(FLOOD_HEIGHT_LEVELS, ordered=True),
+    'reporter_name': object,
+    'reporter_phone': object,
+    'photo_path': object,
+    'ip_address': object,
+    'report_date': 'datetime64[ns]',
+    'report_time': object,
+    'created_at': 'datetime64[ns]',
+    'status': pd.CategoricalDtype(REPORT_STATUSES),
+    'thumbnail_path': object
+}
 
 class FloodReportModel:
     _initialized = False  # ✅ Tambahkan flag untuk mencegah inisialisasi berulang
+    _fts_available = False  # True jika SQLite mendukung FTS5 dan index sudah dibuat
     
     def __init__(self):
         self.db_path = 'flood_system.db'
@@ -14,7 +45,7 @@ class FloodReportModel:
     def init_database(self):
         """Initialize database and tables for flood reports"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.get_connection()
             cursor = conn.cursor()
             
             # Create flood_reports table with IP address field
@@ -30,26 +61,181 @@ class FloodReportModel:
                     report_date DATE DEFAULT CURRENT_DATE,
                     report_time TIME DEFAULT CURRENT_TIME,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    status TEXT DEFAULT 'pending'
+                    status TEXT DEFAULT 'pending',
+                    thumbnail_path TEXT
                 )
             ''')
             
+            # Database lama: tambahkan kolom thumbnail_path (foto lama tetap tanpa thumbnail)
+            cursor.execute('PRAGMA table_info(flood_reports)')
+            if 'thumbnail_path' not in [row[1] for row in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE flood_reports ADD COLUMN thumbnail_path TEXT')
+            
             # Create indexes
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_report_date ON flood_reports(report_date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_flood_height ON flood_reports(flood_height)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_ip_date ON flood_reports(ip_address, report_date)')
+            # Range scan bulanan yang sudah terurut (report_date DESC, created_at DESC)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_report_date_created ON flood_reports(report_date, created_at)')
             
             conn.commit()
             conn.close()
+            
+            FloodReportModel._fts_available = self.init_search_index()
             print("✅ Database flood_reports initialized successfully")
         except Exception as e:
             print(f"❌ Database initialization error: {e}")
 
+    def init_search_index(self):
+        """Buat index FTS5 untuk address dan reporter_name, disinkronkan dengan trigger"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'flood_reports_fts'")
+            exists = cursor.fetchone() is not None
+            
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS flood_reports_fts USING fts5(
+                    address, reporter_name,
+                    content='flood_reports', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS flood_reports_fts_insert AFTER INSERT ON flood_reports BEGIN
+                    INSERT INTO flood_reports_fts(rowid, address, reporter_name)
+                    VALUES (new.id, new.address, new.reporter_name);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS flood_reports_fts_delete AFTER DELETE ON flood_reports BEGIN
+                    INSERT INTO flood_reports_fts(flood_reports_fts, rowid, address, reporter_name)
+                    VALUES ('delete', old.id, old.address, old.reporter_name);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS flood_reports_fts_update AFTER UPDATE OF address, reporter_name ON flood_reports BEGIN
+                    INSERT INTO flood_reports_fts(flood_reports_fts, rowid, address, reporter_name)
+                    VALUES ('delete', old.id, old.address, old.reporter_name);
+                    INSERT INTO flood_reports_fts(rowid, address, reporter_name)
+                    VALUES (new.id, new.address, new.reporter_name);
+                END
+            ''')
+            
+            # Index baru di database lama: isi dari data yang sudah ada
+            if not exists:
+                cursor.execute("INSERT INTO flood_reports_fts(flood_reports_fts) VALUES ('rebuild')")
+            
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"⚠️ FTS5 search index tidak tersedia, pakai LIKE: {e}")
+            if 'conn' in locals():
+                conn.close()
+            return False
+
+    def build_search_query(self, search_term):
+        """Ubah kata kunci bebas jadi query FTS5: setiap token dicocokkan sebagai prefix (AND)"""
+        tokens = re.findall(r'\w+', search_term or '')
+        if not tokens:
+            return None
+        return ' AND '.join(f'"{token}"*' for token in tokens)
+
+    def search_reports(self, search_term, limit=50, year=None, month=None):
+        """
+        Cari laporan berdasarkan alamat/nama pelapor via FTS5 (token + prefix match), urut relevansi.
+        year/month opsional untuk membatasi ke satu bulan.
+        """
+        try:
+            match_query = self.build_search_query(search_term)
+            if match_query is None:
+                return []
+            
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            if FloodReportModel._fts_available:
+                clauses = ['flood_reports_fts MATCH ?']
+                params = [match_query]
+                if year and month:
+                    clauses.append('r.report_date >= ? AND r.report_date < ?')
+                    params.extend(self.get_month_range(year, month))
+                
+                cursor.execute(f'''
+                    SELECT r.* FROM flood_reports_fts
+                    JOIN flood_reports r ON r.id = flood_reports_fts.rowid
+                    WHERE {' AND '.join(clauses)}
+                    ORDER BY bm25(flood_reports_fts), r.report_date DESC
+                    LIMIT ?
+                ''', params + [limit])
+            else:
+                where, params = self._build_like_filter(search_term)
+                if year and month:
+                    where += ' AND report_date >= ? AND report_date < ?'
+                    params.extend(self.get_month_range(year, month))
+                
+                cursor.execute(f'''
+                    SELECT * FROM flood_reports WHERE {where}
+                    ORDER BY report_date DESC, created_at DESC
+                    LIMIT ?
+                ''', params + [limit])
+            
+            reports = cursor.fetchall()
+            conn.close()
+            
+            columns = REPORT_COLUMNS
+            return [dict(zip(columns, report)) for report in reports]
+        except Exception as e:
+            print(f"❌ Error searching reports: {e}")
+            skip_cache()
+            return []
+
+    def reports_to_dataframe(self, rows):
+        """
+        Rows flood_reports -> DataFrame kolomar tanpa dict per baris:
+        dtype sesuai REPORT_DTYPES (flood_height/status categorical, report_date/created_at datetime64).
+        """
+        columns = list(zip(*rows)) if rows else [[] for _ in REPORT_COLUMNS]
+        df = pd.DataFrame(dict(zip(REPORT_COLUMNS, columns)))
+        
+        dtypes = dict(REPORT_DTYPES)
+        for column in ('flood_height', 'status'):
+            # Nilai di luar kategori tetap ditambahkan di belakang agar tidak jadi NaN
+            dtype = dtypes[column]
+            extra = sorted(set(df[column].dropna()) - set(dtype.categories))
+            if extra:
+                dtypes[column] = pd.CategoricalDtype(list(dtype.categories) + extra, ordered=dtype.ordered)
+        df['report_date'] = pd.to_datetime(df['report_date'], format='%Y-%m-%d', errors='coerce')
+        df['created_at'] = pd.to_datetime(df['created_at'], format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        return df.astype(dtypes)
+
+    def get_month_range(self, year=None, month=None):
+        """
+        Range half-open [awal bulan, awal bulan berikutnya) sebagai string YYYY-MM-DD.
+        Filter report_date >= ? AND report_date < ? bisa memakai index (tidak membungkus kolom dengan fungsi).
+        Default bulan berjalan (UTC, sama dengan CURRENT_DATE SQLite).
+        """
+        if year is None or month is None:
+            today = datetime.now(timezone.utc)
+            year, month = today.year, today.month
+        
+        start = f"{year:04d}-{month:02d}-01"
+        if month == 12:
+            end = f"{year + 1:04d}-01-01"
+        else:
+            end = f"{year:04d}-{month + 1:02d}-01"
+        return start, end
+
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get pooled database connection (close() mengembalikan ke pool)"""
+        return get_connection_pool(self.db_path).get_connection()
 
-    def create_report(self, address, flood_height, reporter_name, reporter_phone=None, photo_path=None, ip_address=None):
+    def create_report(self, address, flood_height, reporter_name, reporter_phone=None, photo_path=None, ip_address=None,
+                      thumbnail_path=None):
         """Create new flood report"""
         try:
             conn = self.get_connection()
@@ -58,9 +244,10 @@ class FloodReportModel:
             print(f"🔧 Inserting report: {address}, {flood_height}, {reporter_name}, {reporter_phone}, {photo_path}, {ip_address}")
             
             cursor.execute('''
-                INSERT INTO flood_reports (address, flood_height, reporter_name, reporter_phone, photo_path, ip_address)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (address, flood_height, reporter_name, reporter_phone, photo_path, ip_address))
+                INSERT INTO flood_reports (address, flood_height, reporter_name, reporter_phone, photo_path, ip_address,
+                                           thumbnail_path)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (address, flood_height, reporter_name, reporter_phone, photo_path, ip_address, thumbnail_path))
             
             report_id = cursor.lastrowid
             conn.commit()
@@ -75,6 +262,46 @@ class FloodReportModel:
                 conn.close()
             return None
 
+    def update_report_photo(self, report_id, photo_path, thumbnail_path):
+        """Set path foto hasil proses background (foto ter-encode ulang + thumbnail)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE flood_reports SET photo_path = ?, thumbnail_path = ?
+                WHERE id = ?
+            ''', (photo_path, thumbnail_path, report_id))
+            
+            updated = cursor.rowcount > 0
+            conn.commit()
+            conn.close()
+            return updated
+        except Exception as e:
+            print(f"❌ Error updating report photo: {e}")
+            if 'conn' in locals():
+                conn.close()
+            return False
+
+    def get_reports_without_thumbnail(self):
+        """(id, photo_path) laporan yang punya foto tapi belum punya thumbnail"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, photo_path FROM flood_reports
+                WHERE photo_path IS NOT NULL AND thumbnail_path IS NULL
+                ORDER BY id
+            ''')
+            
+            rows = cursor.fetchall()
+            conn.close()
+            return rows
+        except Exception as e:
+            print(f"❌ Error getting reports without thumbnail: {e}")
+            return []
+
     def get_today_reports_count_by_ip(self, ip_address):
         """Get count of today's reports by IP address"""
         try:
@@ -93,8 +320,8 @@ class FloodReportModel:
             print(f"❌ Error getting today reports count: {e}")
             return 0
 
-    def get_today_reports(self):
-        """Get all flood reports for today"""
+    def get_today_reports(self, as_dataframe=False):
+        """Get all flood reports for today (as_dataframe=True: DataFrame kolomar bertipe)"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
@@ -108,39 +335,145 @@ class FloodReportModel:
             reports = cursor.fetchall()
             conn.close()
             
+            if as_dataframe:
+                return self.reports_to_dataframe(reports)
+            
             # Convert to list of dictionaries
-            columns = ['id', 'address', 'flood_height', 'reporter_name', 'reporter_phone', 
-                      'photo_path', 'ip_address', 'report_date', 'report_time', 'created_at', 'status']
+            columns = REPORT_COLUMNS
             return [dict(zip(columns, report)) for report in reports]
         except Exception as e:
             print(f"❌ Error getting today reports: {e}")
-            return []
+            skip_cache()
+            return self.reports_to_dataframe([]) if as_dataframe else []
 
-    def get_month_reports(self):
-        """Get all flood reports for current month"""
+    def get_month_reports(self, year=None, month=None, as_dataframe=False):
+        """Get all flood reports for a month (default current month; as_dataframe=True: DataFrame bertipe)"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
                 SELECT * FROM flood_reports 
-                WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
+                WHERE report_date >= ? AND report_date < ?
                 ORDER BY report_date DESC, created_at DESC
-            ''')
+            ''', self.get_month_range(year, month))
             
             reports = cursor.fetchall()
             conn.close()
             
+            if as_dataframe:
+                return self.reports_to_dataframe(reports)
+            
             # Convert to list of dictionaries
-            columns = ['id', 'address', 'flood_height', 'reporter_name', 'reporter_phone', 
-                      'photo_path', 'ip_address', 'report_date', 'report_time', 'created_at', 'status']
+            columns = REPORT_COLUMNS
             return [dict(zip(columns, report)) for report in reports]
         except Exception as e:
             print(f"❌ Error getting month reports: {e}")
-            return []
+            skip_cache()
+            return self.reports_to_dataframe([]) if as_dataframe else []
 
-    def get_all_reports(self):
-        """Get all flood reports"""
+    def _build_report_filters(self, year=None, month=None, search_term=None, flood_height=None):
+        """WHERE clause + params untuk filter laporan bulanan"""
+        clauses = ['report_date >= ?', 'report_date < ?']
+        params = list(self.get_month_range(year, month))
+        
+        if search_term:
+            match_query = self.build_search_query(search_term)
+            if FloodReportModel._fts_available and match_query:
+                clauses.append('id IN (SELECT rowid FROM flood_reports_fts WHERE flood_reports_fts MATCH ?)')
+                params.append(match_query)
+            else:
+                like_where, like_params = self._build_like_filter(search_term)
+                clauses.append(like_where)
+                params.extend(like_params)
+        
+        if flood_height:
+            clauses.append('flood_height = ?')
+            params.append(flood_height)
+        
+        return ' AND '.join(clauses), params
+
+    def _build_like_filter(self, search_term):
+        """Fallback pencarian substring (tanpa FTS5)"""
+        pattern = '%' + search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return "(address LIKE ? ESCAPE '\\' OR reporter_name LIKE ? ESCAPE '\\')", [pattern, pattern]
+
+    def get_reports_page(self, year=None, month=None, search_term=None, flood_height=None,
+                         page_size=10, cursor=None):
+        """
+        Satu halaman laporan bulanan (keyset pagination, urut report_date/created_at/id DESC).
+        cursor = (report_date, created_at, id) baris terakhir halaman sebelumnya, None untuk halaman pertama.
+        Return {'reports', 'total', 'next_cursor'}; next_cursor None jika tidak ada halaman berikutnya.
+        """
+        try:
+            conn = self.get_connection()
+            db_cursor = conn.cursor()
+            
+            where, params = self._build_report_filters(year, month, search_term, flood_height)
+            
+            db_cursor.execute(f'SELECT COUNT(*) FROM flood_reports WHERE {where}', params)
+            total = db_cursor.fetchone()[0]
+            
+            page_where, page_params = where, list(params)
+            if cursor is not None:
+                page_where += ' AND (report_date, created_at, id) < (?, ?, ?)'
+                page_params.extend(cursor)
+            
+            # Ambil 1 baris ekstra untuk tahu apakah masih ada halaman berikutnya
+            db_cursor.execute(f'''
+                SELECT * FROM flood_reports 
+                WHERE {page_where}
+                ORDER BY report_date DESC, created_at DESC, id DESC
+                LIMIT ?
+            ''', page_params + [page_size + 1])
+            
+            rows = db_cursor.fetchall()
+            conn.close()
+            
+            columns = REPORT_COLUMNS
+            reports = [dict(zip(columns, row)) for row in rows[:page_size]]
+            
+            next_cursor = None
+            if len(rows) > page_size:
+                last = reports[-1]
+                next_cursor = (last['report_date'], last['created_at'], last['id'])
+            
+            return {'reports': reports, 'total': total, 'next_cursor': next_cursor}
+        except Exception as e:
+            print(f"❌ Error getting reports page: {e}")
+            skip_cache()
+            return {'reports': [], 'total': 0, 'next_cursor': None}
+
+    def get_month_distribution(self, year=None, month=None):
+        """Jumlah laporan per ketinggian banjir dan per tanggal (untuk chart) tanpa mengambil semua baris"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            month_range = self.get_month_range(year, month)
+            
+            cursor.execute('''
+                SELECT flood_height, COUNT(*) AS count FROM flood_reports
+                WHERE report_date >= ? AND report_date < ?
+                GROUP BY flood_height ORDER BY count DESC
+            ''', month_range)
+            height_counts = dict(cursor.fetchall())
+            
+            cursor.execute('''
+                SELECT report_date, COUNT(*) FROM flood_reports
+                WHERE report_date >= ? AND report_date < ?
+                GROUP BY report_date ORDER BY report_date
+            ''', month_range)
+            daily_counts = dict(cursor.fetchall())
+            
+            conn.close()
+            return {'height_counts': height_counts, 'daily_counts': daily_counts}
+        except Exception as e:
+            print(f"❌ Error getting month distribution: {e}")
+            skip_cache()
+            return {'height_counts': {}, 'daily_counts': {}}
+
+    def get_all_reports(self, as_dataframe=False):
+        """Get all flood reports (as_dataframe=True: DataFrame kolomar bertipe)"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
@@ -153,69 +486,62 @@ class FloodReportModel:
             reports = cursor.fetchall()
             conn.close()
             
+            if as_dataframe:
+                return self.reports_to_dataframe(reports)
+            
             # Convert to list of dictionaries
-            columns = ['id', 'address', 'flood_height', 'reporter_name', 'reporter_phone', 
-                      'photo_path', 'ip_address', 'report_date', 'report_time', 'created_at', 'status']
+            columns = REPORT_COLUMNS
             return [dict(zip(columns, report)) for report in reports]
         except Exception as e:
             print(f"❌ Error getting all reports: {e}")
-            return []
+            skip_cache()
+            return self.reports_to_dataframe([]) if as_dataframe else []
 
-    def get_monthly_statistics(self):
-        """Get monthly statistics for reports"""
+    def get_monthly_statistics(self, year=None, month=None):
+        """Get monthly statistics for reports (satu query, satu range scan)"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Total reports this month
+            # CTE dipakai beberapa kali -> SQLite mematerialisasi range bulan ini sekali
             cursor.execute('''
-                SELECT COUNT(*) FROM flood_reports 
-                WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
-            ''')
-            total_reports = cursor.fetchone()[0]
-            
-            # Average reports per day
-            cursor.execute('''
-                SELECT COUNT(DISTINCT report_date) FROM flood_reports 
-                WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
-            ''')
-            days_with_reports = cursor.fetchone()[0]
-            avg_per_day = total_reports / days_with_reports if days_with_reports > 0 else 0
-            
-            # Most common flood height
-            cursor.execute('''
-                SELECT flood_height, COUNT(*) as count 
-                FROM flood_reports 
-                WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
-                GROUP BY flood_height 
-                ORDER BY count DESC 
-                LIMIT 1
-            ''')
-            most_common_height = cursor.fetchone()
-            
-            # Most affected area
-            cursor.execute('''
-                SELECT address, COUNT(*) as count 
-                FROM flood_reports 
-                WHERE strftime('%Y-%m', report_date) = strftime('%Y-%m', 'now')
-                GROUP BY address 
-                ORDER BY count DESC 
-                LIMIT 1
-            ''')
-            most_affected_area = cursor.fetchone()
+                WITH month_reports AS (
+                    SELECT report_date, flood_height, address FROM flood_reports
+                    WHERE report_date >= ? AND report_date < ?
+                ),
+                top_height AS (
+                    SELECT flood_height, COUNT(*) AS count FROM month_reports
+                    GROUP BY flood_height ORDER BY count DESC LIMIT 1
+                ),
+                top_area AS (
+                    SELECT address, COUNT(*) AS count FROM month_reports
+                    GROUP BY address ORDER BY count DESC LIMIT 1
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM month_reports),
+                    (SELECT COUNT(DISTINCT report_date) FROM month_reports),
+                    (SELECT flood_height FROM top_height),
+                    (SELECT count FROM top_height),
+                    (SELECT address FROM top_area),
+                    (SELECT count FROM top_area)
+            ''', self.get_month_range(year, month))
             
+            total_reports, days_with_reports, top_height, top_height_count, top_area, top_area_count = cursor.fetchone()
             conn.close()
             
+            avg_per_day = total_reports / days_with_reports if days_with_reports > 0 else 0
+            
             return {
                 'total_reports': total_reports,
                 'avg_per_day': round(avg_per_day, 1),
-                'most_common_height': most_common_height[0] if most_common_height else 'Tidak ada data',
-                'most_common_height_count': most_common_height[1] if most_common_height else 0,
-                'most_affected_area': most_affected_area[0] if most_affected_area else 'Tidak ada data',
-                'most_affected_area_count': most_affected_area[1] if most_affected_area else 0
+                'most_common_height': top_height if top_height is not None else 'Tidak ada data',
+                'most_common_height_count': top_height_count or 0,
+                'most_affected_area': top_area if top_area is not None else 'Tidak ada data',
+                'most_affected_area_count': top_area_count or 0
             }
         except Exception as e:
             print(f"❌ Error getting monthly statistics: {e}")
+            skip_cache()
             return {
                 'total_reports': 0,
                 'avg_per_day': 0,
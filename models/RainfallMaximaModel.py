@@ -0,0 +1,94 @@
+from models.ConnectionPool import get_connection_pool
+
+class RainfallMaximaModel:
+    _initialized = False  # Flag untuk mencegah inisialisasi berulang
+
+    def __init__(self):
+        self.db_path = 'flood_system.db'
+        if not RainfallMaximaModel._initialized:
+            self.init_database()
+            RainfallMaximaModel._initialized = True
+
+    def init_database(self):
+        """Initialize database and tables for annual maximum rainfall"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            # Satu baris per stasiun per tahun
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS annual_max_rainfall (
+                    station TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    max_rainfall_mm REAL NOT NULL,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (station, year)
+                )
+            ''')
+
+            conn.commit()
+            conn.close()
+            print("✅ Database annual_max_rainfall initialized successfully")
+        except Exception as e:
+            print(f"❌ Database initialization error: {e}")
+
+    def get_connection(self):
+        """Get pooled database connection (close() mengembalikan ke pool)"""
+        return get_connection_pool(self.db_path).get_connection()
+
+    def save_annual_maxima(self, station, maxima):
+        """Simpan/update curah hujan maksimum tahunan: maxima = {year: max_rainfall_mm}"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.executemany('''
+                INSERT INTO annual_max_rainfall (station, year, max_rainfall_mm)
+                VALUES (?, ?, ?)
+                ON CONFLICT(station, year) DO UPDATE SET
+                    max_rainfall_mm = excluded.max_rainfall_mm,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', [(station, int(year), float(value)) for year, value in maxima.items()])
+
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"❌ Error saving annual maxima: {e}")
+            if 'conn' in locals():
+                conn.close()
+            return False
+
+    def get_annual_maxima(self, station):
+        """Get curah hujan maksimum tahunan satu stasiun, urut per tahun"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT year, max_rainfall_mm FROM annual_max_rainfall
+                WHERE station = ?
+                ORDER BY year
+            ''', (station,))
+
+            rows = cursor.fetchall()
+            conn.close()
+            return [{'year': row[0], 'max_rainfall_mm': row[1]} for row in rows]
+        except Exception as e:
+            print(f"❌ Error getting annual maxima: {e}")
+            return []
+
+    def get_stations(self):
+        """Get daftar stasiun yang punya data maksimum tahunan"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT DISTINCT station FROM annual_max_rainfall ORDER BY station')
+
+            stations = [row[0] for row in cursor.fetchall()]
+            conn.close()
+            return stations
+        except Exception as e:
+            print(f"❌ Error getting stations: {e}")
+            return []
@@ -0,0 +1,226 @@
+from models.ConnectionPool import get_connection_pool
+
+# Kode metrik (disimpan sebagai integer agar baris raw tetap sempit)
+METRIC_CODES = {'water_level_mdpl': 1, 'rainfall_mm': 2}
+
+# Resolusi rollup (detik); bucket harian mengikuti tengah malam WIB (UTC+7)
+HOUR = 3600
+DAY = 86400
+LOCAL_UTC_OFFSET = 7 * 3600
+
+class TimeSeriesModel:
+    """
+    Time-series pembacaan stasiun (tinggi muka air / curah hujan).
+    Raw sample di tabel sempit WITHOUT ROWID yang terkluster di (station, metric, ts);
+    trigger AFTER INSERT menjaga rollup per jam dan per hari (count/min/max/sum) sehingga
+    query tren multi-tahun cukup membaca rollup.
+    """
+    _initialized = False  # Flag untuk mencegah inisialisasi berulang
+
+    def __init__(self):
+        self.db_path = 'flood_system.db'
+        if not TimeSeriesModel._initialized:
+            self.init_database()
+            TimeSeriesModel._initialized = True
+
+    def init_database(self):
+        """Initialize database and tables for station time-series"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            # ts = epoch detik (UTC); duplikat (station, metric, ts) diabaikan saat insert
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS station_readings (
+                    station TEXT NOT NULL,
+                    metric INTEGER NOT NULL,
+                    ts INTEGER NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (station, metric, ts)
+                ) WITHOUT ROWID
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS station_reading_rollups (
+                    station TEXT NOT NULL,
+                    metric INTEGER NOT NULL,
+                    resolution INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    min_value REAL NOT NULL,
+                    max_value REAL NOT NULL,
+                    sum_value REAL NOT NULL,
+                    PRIMARY KEY (station, metric, resolution, bucket)
+                ) WITHOUT ROWID
+            ''')
+
+            # Rollup hanya dari baris yang benar-benar masuk (INSERT OR IGNORE tidak memicu trigger)
+            rollup_upsert = '''
+                INSERT INTO station_reading_rollups
+                    (station, metric, resolution, bucket, count, min_value, max_value, sum_value)
+                VALUES (new.station, new.metric, {resolution}, {bucket}, 1, new.value, new.value, new.value)
+                ON CONFLICT (station, metric, resolution, bucket) DO UPDATE SET
+                    count = count + 1,
+                    min_value = MIN(min_value, excluded.min_value),
+                    max_value = MAX(max_value, excluded.max_value),
+                    sum_value = sum_value + excluded.sum_value;
+            '''
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS station_readings_rollup AFTER INSERT ON station_readings BEGIN
+                    {rollup_upsert.format(resolution=HOUR, bucket=f"new.ts - (new.ts % {HOUR})")}
+                    {rollup_upsert.format(resolution=DAY, bucket=f"((new.ts + {LOCAL_UTC_OFFSET}) / {DAY}) * {DAY} - {LOCAL_UTC_OFFSET}")}
+                END
+            ''')
+
+            conn.commit()
+            conn.close()
+            print("✅ Database station_readings initialized successfully")
+        except Exception as e:
+            print(f"❌ Database initialization error: {e}")
+
+    def get_connection(self):
+        """Get pooled database connection (close() mengembalikan ke pool)"""
+        return get_connection_pool(self.db_path).get_connection()
+
+    def add_readings(self, readings):
+        """Simpan pembacaan (station, metric, ts, value); return jumlah baris baru"""
+        try:
+            rows = [(station, METRIC_CODES[metric], int(ts), float(value))
+                    for station, metric, ts, value in readings if value is not None]
+            if not rows:
+                return 0
+
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.executemany('''
+                INSERT OR IGNORE INTO station_readings (station, metric, ts, value)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
+            # rowcount = baris raw yang masuk (perubahan oleh trigger rollup tidak dihitung)
+            inserted = cursor.rowcount
+
+            conn.commit()
+            conn.close()
+            return inserted
+        except Exception as e:
+            print(f"❌ Error adding readings: {e}")
+            if 'conn' in locals():
+                conn.close()
+            return 0
+
+    def record_snapshot(self, water_levels, rainfall):
+        """
+        Simpan record hasil scraping dengan observed_at dari halaman BBWS.
+        Record fallback dan record tanpa waktu observasi dilewati (tidak boleh masuk riwayat).
+        """
+        readings = [(r['location'], 'water_level_mdpl', r['observed_at'], r['water_level_mdpl'])
+                    for r in water_levels if r.get('observed_at') and not r.get('fallback')]
+        readings += [(r['location'], 'rainfall_mm', r['observed_at'], r['rainfall_mm'])
+                     for r in rainfall if r.get('observed_at') and not r.get('fallback')]
+        return self.add_readings(readings)
+
+    def choose_resolution(self, start_ts, end_ts):
+        """Raw untuk <= 2 hari, rollup per jam untuk <= 90 hari, selebihnya rollup harian"""
+        span = end_ts - start_ts
+        if span <= 2 * DAY:
+            return 'raw'
+        if span <= 90 * DAY:
+            return 'hour'
+        return 'day'
+
+    def get_series(self, station, metric, start_ts, end_ts, resolution=None):
+        """
+        Deret waktu [start_ts, end_ts) satu stasiun.
+        resolution 'raw' -> [{'ts', 'value'}]; 'hour'/'day' -> [{'ts', 'count', 'min', 'max', 'mean', 'sum'}].
+        Default dipilih otomatis dari panjang range (choose_resolution).
+        """
+        try:
+            resolution = resolution or self.choose_resolution(start_ts, end_ts)
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            if resolution == 'raw':
+                cursor.execute('''
+                    SELECT ts, value FROM station_readings
+                    WHERE station = ? AND metric = ? AND ts >= ? AND ts < ?
+                    ORDER BY ts
+                ''', (station, METRIC_CODES[metric], int(start_ts), int(end_ts)))
+                series = [{'ts': row[0], 'value': row[1]} for row in cursor.fetchall()]
+            else:
+                cursor.execute('''
+                    SELECT bucket, count, min_value, max_value, sum_value FROM station_reading_rollups
+                    WHERE station = ? AND metric = ? AND resolution = ? AND bucket >= ? AND bucket < ?
+                    ORDER BY bucket
+                ''', (station, METRIC_CODES[metric], HOUR if resolution == 'hour' else DAY,
+                      int(start_ts), int(end_ts)))
+                series = [{'ts': row[0], 'count': row[1], 'min': row[2], 'max': row[3],
+                           'mean': row[4] / row[1], 'sum': row[4]} for row in cursor.fetchall()]
+
+            conn.close()
+            return series
+        except Exception as e:
+            print(f"❌ Error getting series: {e}")
+            if 'conn' in locals():
+                conn.close()
+            return []
+
+    def get_latest(self, station, metric):
+        """Pembacaan terakhir satu stasiun: {'ts', 'value'} atau None"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT ts, value FROM station_readings
+                WHERE station = ? AND metric = ?
+                ORDER BY ts DESC LIMIT 1
+            ''', (station, METRIC_CODES[metric]))
+
+            row = cursor.fetchone()
+            conn.close()
+            return {'ts': row[0], 'value': row[1]} if row else None
+        except Exception as e:
+            print(f"❌ Error getting latest reading: {e}")
+            return None
+
+    def get_stations(self, metric=None):
+        """Daftar stasiun yang punya data (opsional untuk satu metrik)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            # Rollup harian jauh lebih kecil dari raw, cukup untuk daftar stasiun
+            if metric is None:
+                cursor.execute('SELECT DISTINCT station FROM station_reading_rollups WHERE resolution = ? ORDER BY station',
+                               (DAY,))
+            else:
+                cursor.execute('''
+                    SELECT DISTINCT station FROM station_reading_rollups
+                    WHERE resolution = ? AND metric = ? ORDER BY station
+                ''', (DAY, METRIC_CODES[metric]))
+
+            stations = [row[0] for row in cursor.fetchall()]
+            conn.close()
+            return stations
+        except Exception as e:
+            print(f"❌ Error getting stations: {e}")
+            return []
+
+    def prune_raw(self, older_than_ts):
+        """Hapus raw sample lama; rollup jam/hari tetap utuh untuk query tren"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM station_readings WHERE ts < ?', (int(older_than_ts),))
+
+            deleted = cursor.rowcount
+            conn.commit()
+            conn.close()
+            return deleted
+        except Exception as e:
+            print(f"❌ Error pruning readings: {e}")
+            if 'conn' in locals():
+                conn.close()
+            return 0
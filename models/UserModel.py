@@ -1,4 +1,5 @@
 import sqlite3
+from models.ConnectionPool import get_connection_pool
 import hashlib
 import os
 from datetime import datetime
@@ -16,7 +17,7 @@ class UserModel:
     def init_database(self):
         """Initialize database and tables for users"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.get_connection()
             cursor = conn.cursor()
             
             # Create users table
@@ -58,8 +59,8 @@ class UserModel:
             print(f"❌ Database initialization error: {e}")
 
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get pooled database connection (close() mengembalikan ke pool)"""
+        return get_connection_pool(self.db_path).get_connection()
 
     def _hash_password(self, password):
         """Simple password hashing"""
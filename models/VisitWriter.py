@@ -0,0 +1,91 @@
+import atexit
+import queue
+import threading
+import time
+
+class VisitWriter:
+    """
+    Writer background untuk event kunjungan.
+    track_visit hanya memasukkan event ke antrian; thread ini menulis per batch
+    (executemany dalam satu transaksi) setiap batch_size event atau flush_interval_ms.
+    """
+
+    def __init__(self, visitor_model, batch_size=100, flush_interval_ms=500, max_queue=10000):
+        self.visitor_model = visitor_model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='visit-writer', daemon=True)
+        self._thread.start()
+        self.dropped = 0
+
+    def enqueue(self, event):
+        """Masukkan event kunjungan (tidak pernah menunggu disk)"""
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _drain(self, batch, timeout):
+        """Ambil event dari antrian sampai batch penuh atau timeout habis"""
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = []
+            try:
+                # Tunggu event pertama, lalu kumpulkan sisanya sampai batch_size/flush_interval
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                continue
+            self._drain(batch, self.flush_interval)
+            self._write(batch)
+
+    def _write(self, batch):
+        if not batch:
+            return
+        if not self.visitor_model.record_visits_batch(batch):
+            print(f"❌ Visit writer: {len(batch)} event gagal ditulis")
+
+    def flush(self):
+        """Tulis semua event yang masih di antrian (dipanggil saat shutdown)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        self._write(batch)
+
+    def stop(self):
+        """Hentikan thread lalu flush event yang tersisa"""
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval * 2 + 1)
+        self.flush()
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_visit_writer(visitor_model):
+    """Satu VisitWriter per proses, di-flush otomatis saat proses berhenti"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = VisitWriter(visitor_model)
+                atexit.register(_writer.stop)
+    return _writer
@@ -1,8 +1,42 @@
-import sqlite3
+from models.ConnectionPool import get_connection_pool
+from models.HyperLogLog import HyperLogLog
+from query_cache import skip_cache
 import os
+import threading
+import time
+from collections import deque
+
+class OnlineVisitorWindow:
+    """Sliding window IP unik dalam window_seconds terakhir; update dan count amortized O(1)"""
+
+    def __init__(self, window_seconds=300):
+        self.window_seconds = window_seconds
+        self._events = deque()   # (timestamp, ip) urut waktu
+        self._last_seen = {}     # ip -> timestamp terakhir
+        self._lock = threading.Lock()
+
+    def touch(self, ip_address, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._events.append((timestamp, ip_address))
+            self._last_seen[ip_address] = timestamp
+            self._evict(timestamp)
+
+    def _evict(self, now):
+        cutoff = now - self.window_seconds
+        while self._events and self._events[0][0] < cutoff:
+            timestamp, ip_address = self._events.popleft()
+            if self._last_seen.get(ip_address) == timestamp:
+                del self._last_seen[ip_address]
+
+    def count(self):
+        with self._lock:
+            self._evict(time.time())
+            return len(self._last_seen)
 
 class VisitorModel:
     _initialized = False  # ✅ Tambahkan flag untuk mencegah inisialisasi berulang
+    online_window = OnlineVisitorWindow()  # Dibagi semua sesi dalam proses
     
     def __init__(self):
         self.db_path = 'flood_system.db'
@@ -13,7 +47,7 @@ class VisitorModel:
     def init_database(self):
         """Initialize database and tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.get_connection()
             cursor = conn.cursor()
             
             # Create visitor_stats table
@@ -43,38 +77,257 @@ class VisitorModel:
             # Create indexes
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_visit_date ON visitor_stats(visit_date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_page_visited ON visitor_stats(page_visited)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_visitor_created_at ON visitor_stats(created_at)')
+            
+            # Rollup tables - dipelihara incremental saat kunjungan ditulis
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS visitor_daily_ips (
+                    visit_date DATE NOT NULL,
+                    ip_address VARCHAR(45) NOT NULL,
+                    PRIMARY KEY (visit_date, ip_address)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS visitor_monthly_ips (
+                    visit_month CHAR(7) NOT NULL,
+                    ip_address VARCHAR(45) NOT NULL,
+                    PRIMARY KEY (visit_month, ip_address)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS visitor_daily_counts (
+                    visit_date DATE PRIMARY KEY,
+                    unique_visitors INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS visitor_monthly_counts (
+                    visit_month CHAR(7) PRIMARY KEY,
+                    unique_visitors INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS page_daily_counts (
+                    visit_date DATE NOT NULL,
+                    page_visited VARCHAR(255) NOT NULL,
+                    visit_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (visit_date, page_visited)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Sketch HyperLogLog per hari untuk mode unique visitor approximate
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS visitor_daily_hll (
+                    visit_date DATE PRIMARY KEY,
+                    sketch BLOB NOT NULL
+                )
+            ''')
+            
+            self._backfill_rollups(cursor)
+            self._backfill_sketches(cursor)
             
             conn.commit()
             conn.close()
+            
+            self._seed_online_window()
             print("✅ Database visitor_stats initialized successfully")
         except Exception as e:
             print(f"Database initialization error: {e}")
 
+    def _backfill_rollups(self, cursor):
+        """Isi rollup dari visitor_stats lama (hanya sekali, saat rollup masih kosong)"""
+        cursor.execute('SELECT 1 FROM visitor_daily_counts LIMIT 1')
+        if cursor.fetchone():
+            return
+        
+        cursor.execute('''
+            INSERT OR IGNORE INTO visitor_daily_ips (visit_date, ip_address)
+            SELECT DISTINCT visit_date, ip_address FROM visitor_stats WHERE ip_address IS NOT NULL
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO visitor_monthly_ips (visit_month, ip_address)
+            SELECT DISTINCT substr(visit_date, 1, 7), ip_address FROM visitor_stats WHERE ip_address IS NOT NULL
+        ''')
+        cursor.execute('''
+            INSERT OR REPLACE INTO visitor_daily_counts (visit_date, unique_visitors)
+            SELECT visit_date, COUNT(*) FROM visitor_daily_ips GROUP BY visit_date
+        ''')
+        cursor.execute('''
+            INSERT OR REPLACE INTO visitor_monthly_counts (visit_month, unique_visitors)
+            SELECT visit_month, COUNT(*) FROM visitor_monthly_ips GROUP BY visit_month
+        ''')
+        cursor.execute('''
+            INSERT OR REPLACE INTO page_daily_counts (visit_date, page_visited, visit_count)
+            SELECT visit_date, page_visited, COUNT(*) FROM visitor_stats
+            WHERE page_visited IS NOT NULL GROUP BY visit_date, page_visited
+        ''')
+
+    def _backfill_sketches(self, cursor):
+        """Bangun sketch harian dari visitor_daily_ips (hanya sekali, saat tabel sketch masih kosong)"""
+        cursor.execute('SELECT 1 FROM visitor_daily_hll LIMIT 1')
+        if cursor.fetchone():
+            return
+        
+        cursor.execute('SELECT visit_date, ip_address FROM visitor_daily_ips ORDER BY visit_date')
+        sketches = {}
+        for visit_date, ip_address in cursor.fetchall():
+            sketches.setdefault(visit_date, HyperLogLog()).add(ip_address)
+        
+        cursor.executemany('INSERT INTO visitor_daily_hll (visit_date, sketch) VALUES (?, ?)',
+                           [(visit_date, sketch.to_bytes()) for visit_date, sketch in sketches.items()])
+
+    def _update_sketches(self, cursor, new_daily_visitors):
+        """Tambahkan IP baru ke sketch harian masing-masing tanggal"""
+        for visit_date, ip_addresses in new_daily_visitors.items():
+            cursor.execute('SELECT sketch FROM visitor_daily_hll WHERE visit_date = ?', (visit_date,))
+            row = cursor.fetchone()
+            sketch = HyperLogLog.from_bytes(row[0]) if row else HyperLogLog()
+            sketch.update(ip_addresses)
+            cursor.execute('INSERT OR REPLACE INTO visitor_daily_hll (visit_date, sketch) VALUES (?, ?)',
+                           (visit_date, sketch.to_bytes()))
+
+    def _merged_sketch(self, start_date=None, end_date=None):
+        """Merge sketch harian dalam range tanggal (inklusif); None = tanpa batas"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT sketch FROM visitor_daily_hll
+            WHERE visit_date BETWEEN ? AND ?
+        ''', (start_date or '0000-01-01', end_date or '9999-12-31'))
+        
+        merged = HyperLogLog()
+        for (data,) in cursor.fetchall():
+            merged.merge(HyperLogLog.from_bytes(data))
+        conn.close()
+        return merged
+
+    def _seed_online_window(self):
+        """Isi window online dari DB saat proses start (query sargable pada created_at)"""
+        try:
+            from datetime import datetime, timedelta, timezone
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            now = datetime.now(timezone.utc)
+            cutoff = (now - timedelta(seconds=VisitorModel.online_window.window_seconds)).strftime('%Y-%m-%d %H:%M:%S')
+            cursor.execute('''
+                SELECT ip_address, MAX(created_at) FROM visitor_stats
+                WHERE created_at >= ?
+                GROUP BY ip_address
+            ''', (cutoff,))
+            
+            for ip_address, created_at in cursor.fetchall():
+                seen = datetime.strptime(created_at, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+                VisitorModel.online_window.touch(ip_address, seen.timestamp())
+            conn.close()
+        except Exception as e:
+            print(f"Error seeding online visitors: {e}")
+
+    def _update_rollups(self, cursor, events):
+        """Update rollup harian/bulanan dan per-halaman untuk batch event (dalam transaksi pemanggil)"""
+        visitors = set()
+        new_daily_visitors = {}
+        page_counts = {}
+        for event in events:
+            ip_address, page_visited, visit_date = event[0], event[2], event[3]
+            visitors.add((visit_date, ip_address))
+            key = (visit_date, page_visited)
+            page_counts[key] = page_counts.get(key, 0) + 1
+        
+        for visit_date, ip_address in visitors:
+            cursor.execute('INSERT OR IGNORE INTO visitor_daily_ips (visit_date, ip_address) VALUES (?, ?)',
+                           (visit_date, ip_address))
+            if cursor.rowcount == 1:
+                new_daily_visitors.setdefault(visit_date, []).append(ip_address)
+                cursor.execute('''
+                    INSERT INTO visitor_daily_counts (visit_date, unique_visitors) VALUES (?, 1)
+                    ON CONFLICT(visit_date) DO UPDATE SET unique_visitors = unique_visitors + 1
+                ''', (visit_date,))
+            
+            visit_month = visit_date[:7]
+            cursor.execute('INSERT OR IGNORE INTO visitor_monthly_ips (visit_month, ip_address) VALUES (?, ?)',
+                           (visit_month, ip_address))
+            if cursor.rowcount == 1:
+                cursor.execute('''
+                    INSERT INTO visitor_monthly_counts (visit_month, unique_visitors) VALUES (?, 1)
+                    ON CONFLICT(visit_month) DO UPDATE SET unique_visitors = unique_visitors + 1
+                ''', (visit_month,))
+        
+        self._update_sketches(cursor, new_daily_visitors)
+        
+        cursor.executemany('''
+            INSERT INTO page_daily_counts (visit_date, page_visited, visit_count) VALUES (?, ?, ?)
+            ON CONFLICT(visit_date, page_visited) DO UPDATE SET visit_count = visit_count + excluded.visit_count
+        ''', [(visit_date, page, count) for (visit_date, page), count in page_counts.items()])
+
+    def mark_online(self, ip_address):
+        """Catat IP sebagai online (window in-memory, tanpa query)"""
+        VisitorModel.online_window.touch(ip_address)
+
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get pooled database connection (close() mengembalikan ke pool)"""
+        return get_connection_pool(self.db_path).get_connection()
 
     def record_visit(self, page_visited=''):
         """Record new visit"""
+        event = self.build_visit_event(page_visited)
+        self.mark_online(event[0])
+        return self.record_visits_batch([event])
+
+    def build_visit_event(self, page_visited='', page_title=''):
+        """Buat event kunjungan (ditulis nanti oleh VisitWriter lewat record_visits_batch)"""
+        from datetime import datetime, timezone
+        return (
+            self.get_client_ip(),
+            self.get_user_agent(),
+            page_visited,
+            self.get_current_date(),
+            self.get_current_time(),
+            datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),  # sama dengan CURRENT_TIMESTAMP
+            page_title
+        )
+
+    def record_visits_batch(self, events):
+        """Record banyak kunjungan sekaligus dalam satu transaksi"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            ip_address = self.get_client_ip()
-            user_agent = self.get_user_agent()
-            visit_date = self.get_current_date()
-            visit_time = self.get_current_time()
+            cursor.executemany('''
+                INSERT INTO visitor_stats (ip_address, user_agent, page_visited, visit_date, visit_time, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [event[:6] for event in events])
             
-            cursor.execute('''
-                INSERT INTO visitor_stats (ip_address, user_agent, page_visited, visit_date, visit_time)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (ip_address, user_agent, page_visited, visit_date, visit_time))
+            self._update_rollups(cursor, events)
+            
+            # Agregasi popular pages per batch: satu UPDATE/INSERT per halaman
+            page_counts = {}
+            for event in events:
+                page_url, page_title, created_at = event[2], event[6], event[5]
+                if page_title:
+                    count, _, _ = page_counts.get(page_url, (0, page_title, created_at))
+                    page_counts[page_url] = (count + 1, page_title, created_at)
+            
+            for page_url, (count, page_title, last_visited) in page_counts.items():
+                cursor.execute('''
+                    UPDATE popular_pages 
+                    SET visit_count = visit_count + ?, last_visited = ? 
+                    WHERE page_url = ?
+                ''', (count, last_visited, page_url))
+                if cursor.rowcount == 0:
+                    cursor.execute('''
+                        INSERT INTO popular_pages (page_url, page_title, visit_count, last_visited) 
+                        VALUES (?, ?, ?, ?)
+                    ''', (page_url, page_title, count, last_visited))
             
             conn.commit()
             conn.close()
             return True
         except Exception as e:
-            print(f"Error recording visit: {e}")
+            print(f"Error recording visit batch: {e}")
+            if 'conn' in locals():
+                conn.close()
             return False
 
     def update_popular_page(self, page_url, page_title):
@@ -115,8 +368,7 @@ class VisitorModel:
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT COUNT(DISTINCT ip_address) as count 
-                FROM visitor_stats 
+                SELECT unique_visitors FROM visitor_daily_counts 
                 WHERE visit_date = ?
             ''', (self.get_current_date(),))
             
@@ -125,47 +377,61 @@ class VisitorModel:
             return result[0] if result else 0
         except Exception as e:
             print(f"Error getting today visitors: {e}")
+            skip_cache()
             return 0
 
-    def get_month_visitors(self):
-        """Get this month's unique visitors"""
+    def get_month_visitors(self, approximate=False):
+        """Get this month's unique visitors (approximate=True: merge sketch HyperLogLog harian)"""
         try:
+            if approximate:
+                first_day = self.get_current_date()[:8] + '01'  # YYYY-MM-01
+                return self._merged_sketch(first_day, self.get_current_date()).count()
+            
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            first_day = self.get_current_date()[:8] + '01'  # YYYY-MM-01
-            last_day = self.get_current_date()[:8] + '31'   # YYYY-MM-31
-            
             cursor.execute('''
-                SELECT COUNT(DISTINCT ip_address) as count 
-                FROM visitor_stats 
-                WHERE visit_date BETWEEN ? AND ?
-            ''', (first_day, last_day))
+                SELECT unique_visitors FROM visitor_monthly_counts 
+                WHERE visit_month = ?
+            ''', (self.get_current_date()[:7],))
             
             result = cursor.fetchone()
             conn.close()
             return result[0] if result else 0
         except Exception as e:
             print(f"Error getting month visitors: {e}")
+            skip_cache()
             return 0
 
-    def get_online_visitors(self):
-        """Get online visitors (last 5 minutes)"""
+    def get_unique_visitors(self, start_date=None, end_date=None, approximate=True):
+        """Unique visitors dalam range tanggal (inklusif, None = semua waktu)"""
         try:
+            if approximate:
+                return self._merged_sketch(start_date, end_date).count()
+            
             conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT COUNT(DISTINCT ip_address) as count 
-                FROM visitor_stats 
-                WHERE datetime(created_at) >= datetime('now', '-5 minutes')
-            ''')
+                SELECT COUNT(DISTINCT ip_address) FROM visitor_daily_ips
+                WHERE visit_date BETWEEN ? AND ?
+            ''', (start_date or '0000-01-01', end_date or '9999-12-31'))
             
             result = cursor.fetchone()
             conn.close()
             return result[0] if result else 0
+        except Exception as e:
+            print(f"Error getting unique visitors: {e}")
+            skip_cache()
+            return 0
+
+    def get_online_visitors(self):
+        """Get online visitors (last 5 minutes) dari sliding window in-memory"""
+        try:
+            return VisitorModel.online_window.count()
         except Exception as e:
             print(f"Error getting online visitors: {e}")
+            skip_cache()
             return 0
 
     def get_today_popular_pages(self, limit=5):
@@ -175,10 +441,9 @@ class VisitorModel:
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT page_visited, COUNT(*) as visit_count 
-                FROM visitor_stats 
+                SELECT page_visited, visit_count 
+                FROM page_daily_counts 
                 WHERE visit_date = ? AND page_visited != ''
-                GROUP BY page_visited 
                 ORDER BY visit_count DESC 
                 LIMIT ?
             ''', (self.get_current_date(), limit))
@@ -189,6 +454,7 @@ class VisitorModel:
             return [{'page_visited': row[0], 'visit_count': row[1]} for row in results]
         except Exception as e:
             print(f"Error getting popular pages: {e}")
+            skip_cache()
             return []
 
     # Helper methods
@@ -0,0 +1,103 @@
+import functools
+import threading
+import time
+
+class QueryCache:
+    """
+    Cache hasil query per proses (dibagi semua sesi Streamlit) dengan TTL per query.
+    Entry dikelompokkan per namespace agar bisa di-invalidate sekaligus setelah write.
+    Nilai yang di-cache dipakai bersama, jadi pemanggil tidak boleh memodifikasinya.
+    Hasil compute tidak disimpan jika namespace di-invalidate selama compute berjalan,
+    atau jika compute memanggil skip_cache() (nilai default dari cabang except).
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = {}      # key -> (expires_at, value)
+        self._stats = {}        # namespace -> {'hits', 'misses', 'invalidations'}
+        self._generations = {}  # namespace -> jumlah invalidate
+        self._lock = threading.Lock()
+
+    def _namespace_stats(self, namespace):
+        return self._stats.setdefault(namespace, {'hits': 0, 'misses': 0, 'invalidations': 0})
+
+    def get_or_compute(self, namespace, key, ttl, compute):
+        """Return nilai cache jika masih valid, jika tidak panggil compute() dan simpan"""
+        full_key = (namespace, key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] > now:
+                self._namespace_stats(namespace)['hits'] += 1
+                return entry[1]
+            self._namespace_stats(namespace)['misses'] += 1
+            generation = self._generations.get(namespace, 0)
+
+        # Flag skip per compute; compute bersarang yang gagal juga membatalkan cache luarnya
+        outer_skip = getattr(_compute_state, 'skip', False)
+        _compute_state.skip = False
+        try:
+            value = compute()
+        finally:
+            skipped = _compute_state.skip
+            _compute_state.skip = outer_skip or skipped
+
+        with self._lock:
+            # Invalidate selama compute: nilai mungkin sudah basi, jangan ditulis balik
+            if skipped or self._generations.get(namespace, 0) != generation:
+                return value
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[full_key] = (now + ttl, value)
+        return value
+
+    def _evict(self, now):
+        """Buang entry kadaluarsa; jika masih penuh, buang entry tertua"""
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, namespace):
+        """Hapus semua entry satu namespace (mis. setelah laporan baru disimpan)"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._namespace_stats(namespace)['invalidations'] += 1
+
+    def stats(self):
+        """Hit/miss per namespace + jumlah entry aktif"""
+        with self._lock:
+            result = {namespace: dict(values) for namespace, values in self._stats.items()}
+            for namespace, _ in self._entries:
+                result.setdefault(namespace, {'hits': 0, 'misses': 0, 'invalidations': 0})
+                result[namespace]['entries'] = result[namespace].get('entries', 0) + 1
+            for values in result.values():
+                lookups = values['hits'] + values['misses']
+                values.setdefault('entries', 0)
+                values['hit_rate'] = round(values['hits'] / lookups, 3) if lookups else 0.0
+            return result
+
+_compute_state = threading.local()
+
+def skip_cache():
+    """Tandai hasil compute yang sedang berjalan di thread ini agar tidak di-cache (mis. nilai default saat error)"""
+    _compute_state.skip = True
+
+_query_cache = QueryCache()
+
+def get_query_cache():
+    """Cache query bersama per proses"""
+    return _query_cache
+
+def cached_query(namespace, ttl):
+    """Decorator method controller: cache hasil per (method, argumen) selama ttl detik"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            return _query_cache.get_or_compute(namespace, key, ttl, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,154 @@
+"""
+Arsip curah hujan harian historis per stasiun untuk ekstraksi maksimum tahunan (Gumbel).
+
+Format file (satu file biner):
+    [0:8]     magic b'RAINARC1'
+    [8:12]    panjang header JSON (uint32 little-endian)
+    [12:...]  header JSON: {"start_date", "n_days", "stations": [...], "dtype": "<f4"}
+    [4096*k]  data float32 (n_stations, n_days), baris = stasiun sesuai urutan header
+
+Setiap stasiun memakai kalender yang sama (fixed width, hari tanpa data = NaN), jadi
+array dibuka dengan np.memmap dan maksimum tahunan/blok dihitung dengan reduceat/reshape
+per potongan baris tanpa memuat seluruh arsip ke RAM.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+RAINFALL_ARCHIVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rainfall_archive.bin')
+
+ARCHIVE_MAGIC = b'RAINARC1'
+DATA_ALIGNMENT = 4096
+ARCHIVE_DTYPE = np.dtype('<f4')
+
+def write_rainfall_archive(series, path=RAINFALL_ARCHIVE_PATH, start_date=None, end_date=None):
+    """
+    Tulis arsip dari {station: (start_date 'YYYY-MM-DD', daily_values)}.
+    Kalender bersama = start_date..end_date (default: gabungan semua stasiun).
+    Ditulis ke file sementara lalu di-rename, jadi pembaca tidak melihat arsip setengah jadi.
+    """
+    stations = sorted(series)
+    starts = {station: np.datetime64(series[station][0], 'D') for station in stations}
+    first = np.datetime64(start_date, 'D') if start_date else min(starts.values())
+    last = (np.datetime64(end_date, 'D') if end_date else
+            max(starts[s] + len(series[s][1]) - 1 for s in stations))
+    n_days = int((last - first).astype(int)) + 1
+
+    header = json.dumps({
+        'start_date': str(first),
+        'n_days': n_days,
+        'stations': stations,
+        'dtype': ARCHIVE_DTYPE.str
+    }).encode('utf-8')
+    data_offset = -(-(12 + len(header)) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(ARCHIVE_MAGIC + struct.pack('<I', len(header)) + header)
+        f.truncate(data_offset + len(stations) * n_days * ARCHIVE_DTYPE.itemsize)
+
+    data = np.memmap(tmp_path, dtype=ARCHIVE_DTYPE, mode='r+', offset=data_offset, shape=(len(stations), n_days))
+    for row, station in enumerate(stations):
+        values = np.asarray(series[station][1], dtype=ARCHIVE_DTYPE)
+        begin = int((starts[station] - first).astype(int))
+        # Potong bagian yang di luar kalender arsip
+        src_begin, dst_begin = max(0, -begin), max(0, begin)
+        count = min(len(values) - src_begin, n_days - dst_begin)
+        data[row] = np.nan
+        if count > 0:
+            data[row, dst_begin:dst_begin + count] = values[src_begin:src_begin + count]
+    data.flush()
+    del data
+
+    os.replace(tmp_path, path)
+    return path
+
+class RainfallArchive:
+    """Arsip read-only; data (n_stations, n_days) di-memory-map"""
+
+    def __init__(self, path=RAINFALL_ARCHIVE_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(8) != ARCHIVE_MAGIC:
+                raise ValueError(f"{path} bukan arsip curah hujan")
+            header_length = struct.unpack('<I', f.read(4))[0]
+            header = json.loads(f.read(header_length))
+
+        self.stations = header['stations']
+        self.station_index = {station: row for row, station in enumerate(self.stations)}
+        self.start_date = np.datetime64(header['start_date'], 'D')
+        self.n_days = header['n_days']
+        data_offset = -(-(12 + header_length) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+        self.data = np.memmap(path, dtype=np.dtype(header['dtype']), mode='r', offset=data_offset,
+                              shape=(len(self.stations), self.n_days))
+
+    def series(self, station):
+        """View harian satu stasiun (tanpa copy)"""
+        return self.data[self.station_index[station]]
+
+    def _rows(self, stations):
+        if stations is None:
+            return np.arange(len(self.stations))
+        return np.array([self.station_index[station] for station in stations], dtype=int)
+
+    def _chunk(self, rows, stations, begin, chunk_rows):
+        # Semua stasiun: slice baris berurutan (view memmap); subset: fancy index per chunk
+        if stations is None:
+            return self.data[begin:begin + chunk_rows]
+        return self.data[rows[begin:begin + chunk_rows]]
+
+    def year_starts(self):
+        """(years, index hari pertama tiap tahun kalender di dalam arsip)"""
+        last_day = self.start_date + (self.n_days - 1)
+        first_year = self.start_date.astype('datetime64[Y]')
+        years = np.arange(first_year, last_day.astype('datetime64[Y]') + 1)
+        starts = np.maximum((years.astype('datetime64[D]') - self.start_date).astype(int), 0)
+        return years.astype(int) + 1970, starts
+
+    def annual_maxima(self, stations=None, min_valid_days=300, chunk_rows=256):
+        """
+        Maksimum harian per tahun kalender: return (years, maxima (n_stations, n_years)).
+        Tahun dengan hari valid < min_valid_days (mis. tahun pertama/terakhir yang terpotong) = NaN.
+        Dihitung per chunk_rows stasiun sehingga memori tidak tergantung ukuran arsip.
+        """
+        years, starts = self.year_starts()
+        rows = self._rows(stations)
+        maxima = np.empty((len(rows), len(years)), dtype=np.float32)
+
+        for begin in range(0, len(rows), chunk_rows):
+            block = self._chunk(rows, stations, begin, chunk_rows)
+            valid = ~np.isnan(block)
+            # fmax mengabaikan NaN; blok tahun yang seluruhnya NaN tetap NaN
+            chunk_max = np.fmax.reduceat(block, starts, axis=1)
+            valid_days = np.add.reduceat(valid, starts, axis=1, dtype=np.int32)
+            chunk_max[valid_days < min_valid_days] = np.nan
+            maxima[begin:begin + chunk_rows] = chunk_max
+
+        return years, maxima
+
+    def block_maxima(self, block_days, stations=None, min_valid_fraction=0.8, chunk_rows=256):
+        """
+        Maksimum per blok block_days hari sejak start_date (reshape + reduce, sisa hari di akhir diabaikan).
+        Return (block_start_dates, maxima (n_stations, n_blocks)).
+        """
+        n_blocks = self.n_days // block_days
+        rows = self._rows(stations)
+        maxima = np.empty((len(rows), n_blocks), dtype=np.float32)
+
+        for begin in range(0, len(rows), chunk_rows):
+            block = self._chunk(rows, stations, begin, chunk_rows)[:, :n_blocks * block_days]
+            block = block.reshape(len(block), n_blocks, block_days)
+            chunk_max = np.fmax.reduce(block, axis=2)
+            valid_days = np.count_nonzero(~np.isnan(block), axis=2)
+            chunk_max[valid_days < min_valid_fraction * block_days] = np.nan
+            maxima[begin:begin + chunk_rows] = chunk_max
+
+        block_starts = self.start_date + np.arange(n_blocks) * block_days
+        return block_starts, maxima
+
+    def station_annual_maxima(self, station, min_valid_days=300):
+        """{year: max_rainfall_mm} satu stasiun (tahun tidak lengkap dilewati)"""
+        years, maxima = self.annual_maxima([station], min_valid_days=min_valid_days)
+        return {int(year): float(value) for year, value in zip(years, maxima[0]) if not np.isnan(value)}
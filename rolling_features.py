@@ -0,0 +1,199 @@
+"""
+Fitur antecedent per stasiun untuk scoring batch: akumulasi hujan 3/24/72 jam dan laju
+kenaikan muka air (slope least-squares, m/jam).
+
+Pembacaan disimpan di ring buffer berbentuk array (n_stasiun x kapasitas) per metric, satu baris
+per stasiun, jadi satu pembacaan baru = satu tulis ke slot berikutnya. Akumulasi semua window dan
+slope untuk seluruh stasiun dihitung dalam satu pass NumPy (satu kali ambil lock) per siklus prediksi.
+Pembacaan curah hujan dianggap akumulasi sejak pembacaan sebelumnya (telemetri per jam BBWS).
+"""
+import threading
+import time
+
+import numpy as np
+
+HOUR = 3600
+
+RAINFALL_WINDOWS = (('rainfall_3h_mm', 3 * HOUR), ('rainfall_24h_mm', 24 * HOUR), ('rainfall_72h_mm', 72 * HOUR))
+RISE_WINDOW = 3 * HOUR
+# 72 jam pada cadence 5 menit = 864 sampel
+RING_CAPACITY = 1024
+
+FEATURE_COLUMNS = (('rainfall_mm',) + tuple(name for name, _ in RAINFALL_WINDOWS) +
+                   ('water_level_mdpl', 'water_rise_m_per_h'))
+
+class StationRingBuffer:
+    """
+    Ring buffer (timestamp, nilai) untuk banyak stasiun: array (n_stasiun x capacity), baris per stasiun.
+    Slot kosong bertimestamp -inf sehingga tidak pernah masuk window. Tidak thread-safe sendiri.
+    """
+
+    def __init__(self, capacity=RING_CAPACITY, initial_rows=16):
+        self.capacity = capacity
+        self.rows = {}  # station -> index baris
+        self.ts = np.full((initial_rows, capacity), -np.inf)
+        self.values = np.zeros((initial_rows, capacity))
+        self.next_slot = np.zeros(initial_rows, dtype=np.intp)
+
+    def _row(self, station):
+        row = self.rows.get(station)
+        if row is None:
+            row = self.rows[station] = len(self.rows)
+            if row == len(self.ts):
+                # Gandakan kapasitas baris
+                grow = len(self.ts)
+                self.ts = np.vstack([self.ts, np.full((grow, self.capacity), -np.inf)])
+                self.values = np.vstack([self.values, np.zeros((grow, self.capacity))])
+                self.next_slot = np.concatenate([self.next_slot, np.zeros(grow, dtype=np.intp)])
+        return row
+
+    def add(self, station, ts, value):
+        """Tulis pembacaan ke slot berikutnya; saat penuh menimpa sampel tertua"""
+        row = self._row(station)
+        slot = self.next_slot[row]
+        self.ts[row, slot] = ts
+        self.values[row, slot] = value
+        self.next_slot[row] = (slot + 1) % self.capacity
+
+    def lookup(self, stations):
+        """Index baris (array) untuk daftar nama stasiun, -1 jika belum ada riwayat"""
+        return np.array([self.rows.get(station, -1) for station in stations], dtype=np.intp)
+
+    def window_sums(self, rows, now, windows):
+        """Jumlah nilai bertimestamp > now - window, per window: (len(rows) x len(windows))"""
+        ts, values = self.ts[rows], self.values[rows]
+        return np.column_stack([np.where(ts > now - window, values, 0.0).sum(axis=1) for window in windows])
+
+    def window_slopes(self, rows, now, window):
+        """Slope least-squares (nilai per jam) sampel di dalam window; 0 jika sampel kurang dari dua"""
+        ts, values = self.ts[rows], self.values[rows]
+        inside = ts > now - window
+        # Waktu relatif terhadap now (jam) agar Σt² tetap kecil
+        t = np.where(inside, (ts - now) / HOUR, 0.0)
+        v = np.where(inside, values, 0.0)
+        n = inside.sum(axis=1)
+        sum_t, sum_v = t.sum(axis=1), v.sum(axis=1)
+        numerator = n * (t * v).sum(axis=1) - sum_t * sum_v
+        denominator = n * (t * t).sum(axis=1) - sum_t * sum_t
+        valid = (n >= 2) & (denominator > 1e-12)
+        return np.where(valid, numerator / np.where(valid, denominator, 1.0), 0.0)
+
+class RollingFeatureEngine:
+    """
+    Buffer rolling semua stasiun (thread-safe): scheduler memasukkan pembacaan setiap poll,
+    pipeline prediksi membaca matriks fitur (N pos TMA x FEATURE_COLUMNS).
+    Pembacaan dengan observed_at yang tidak lebih baru dari sebelumnya diabaikan,
+    karena BBWS menampilkan pembacaan jam yang sama di banyak poll.
+    """
+
+    def __init__(self, rainfall_windows=RAINFALL_WINDOWS, rise_window=RISE_WINDOW, capacity=RING_CAPACITY):
+        self.rainfall_windows = rainfall_windows
+        self.rise_window = rise_window
+        self.capacity = capacity
+        self._rainfall = StationRingBuffer(capacity)
+        self._water = StationRingBuffer(capacity)
+        self._last_ts = {}   # (metric, station) -> observed_at terakhir
+        self._lock = threading.Lock()
+
+    def add_reading(self, metric, station, ts, value):
+        """Tambah satu pembacaan ('rainfall_mm' / 'water_level_mdpl'); return False jika diabaikan"""
+        if value is None:
+            return False
+        key = (metric, station)
+        with self._lock:
+            if ts <= self._last_ts.get(key, float('-inf')):
+                return False
+            self._last_ts[key] = ts
+            buffer = self._rainfall if metric == 'rainfall_mm' else self._water
+            buffer.add(station, ts, float(value))
+            return True
+
+    def ingest(self, water_levels, rainfall):
+        """
+        Masukkan record hasil scraping; return jumlah yang masuk.
+        Record fallback dan record tanpa observed_at dilewati: tanpa waktu observasi yang asli,
+        pembacaan yang sama akan terhitung ulang di setiap poll.
+        """
+        added = 0
+        for metric, records in (('water_level_mdpl', water_levels), ('rainfall_mm', rainfall)):
+            for record in records:
+                if record.get('observed_at') and not record.get('fallback'):
+                    added += self.add_reading(metric, record['location'], record['observed_at'], record[metric])
+        return added
+
+    def warm_start(self, timeseries_model, now=None):
+        """Isi buffer dari raw time-series (window terpanjang) setelah proses restart"""
+        now = now or int(time.time())
+        start = now - max([window for _, window in self.rainfall_windows] + [self.rise_window])
+        added = 0
+        for metric in ('water_level_mdpl', 'rainfall_mm'):
+            for station in timeseries_model.get_stations(metric):
+                for sample in timeseries_model.get_series(station, metric, start, now + 1, resolution='raw'):
+                    added += self.add_reading(metric, station, sample['ts'], sample['value'])
+        return added
+
+    def window_features(self, rainfall_stations, water_stations, now=None):
+        """
+        Satu pass terkunci untuk banyak stasiun sekaligus. Return (totals, known, rises):
+        totals (len(rainfall_stations) x n_window) akumulasi hujan, known = mask stasiun hujan yang
+        sudah punya riwayat, rises (len(water_stations),) laju kenaikan muka air m/jam.
+        """
+        now = now or time.time()
+        windows = [window for _, window in self.rainfall_windows]
+        with self._lock:
+            rain_rows = self._rainfall.lookup(rainfall_stations)
+            water_rows = self._water.lookup(water_stations)
+            totals = self._rainfall.window_sums(rain_rows, now, windows).reshape(len(rain_rows), len(windows))
+            rises = self._water.window_slopes(water_rows, now, self.rise_window)
+        known = rain_rows >= 0
+        totals[~known] = 0.0
+        rises[water_rows < 0] = 0.0
+        return totals, known, rises
+
+    def rainfall_totals(self, station, now=None):
+        """Akumulasi hujan per window (urut RAINFALL_WINDOWS), atau None jika belum ada riwayat"""
+        totals, known, _ = self.window_features([station], [], now)
+        return totals[0].tolist() if known[0] else None
+
+    def water_rise(self, station, now=None):
+        """Laju kenaikan muka air (m/jam) dalam rise_window; 0 jika sampel kurang dari dua"""
+        _, _, rises = self.window_features([], [station], now)
+        return float(rises[0])
+
+    def feature_matrix(self, water_levels, rainfall, rain_index, now=None):
+        """
+        Matriks fitur (len(water_levels), len(FEATURE_COLUMNS)) untuk scoring batch.
+        rain_index = index record rainfall per pos TMA (-1 = tidak ada, hujan dianggap 0).
+        Stasiun yang belum punya riwayat memakai pembacaan saat ini sebagai akumulasi.
+        """
+        n = len(water_levels)
+        n_windows = len(self.rainfall_windows)
+        rain_index = np.asarray(rain_index, dtype=np.intp).reshape(n)
+        matched = rain_index >= 0
+
+        current_rain = np.array([gauge['rainfall_mm'] for gauge in rainfall], dtype=float)
+        totals, known, rises = self.window_features([gauge['location'] for gauge in rainfall],
+                                                    [water['location'] for water in water_levels], now)
+        # Pos hujan tanpa riwayat: akumulasi = pembacaan saat ini
+        totals[~known] = current_rain[~known, None]
+
+        matrix = np.zeros((n, len(FEATURE_COLUMNS)))
+        matrix[matched, 0] = current_rain[rain_index[matched]]
+        matrix[matched, 1:1 + n_windows] = totals[rain_index[matched]]
+        matrix[:, 1 + n_windows] = [water['water_level_mdpl'] for water in water_levels]
+        matrix[:, 2 + n_windows] = rises
+        return matrix
+
+# Buffer dipakai bersama oleh scheduler dan controller dalam satu proses
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_feature_engine(timeseries_model=None):
+    """RollingFeatureEngine per proses; saat dibuat, buffer diisi dari time-series jika tersedia"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = RollingFeatureEngine()
+            if timeseries_model is not None:
+                _engine.warm_start(timeseries_model)
+        return _engine
@@ -0,0 +1,35 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from controllers.AsyncHttpClient import AsyncHttpClient
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    responses = []
+
+    def do_GET(self):
+        status, body = self.responses.pop(0)
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_http_error_returns_last_good_body():
+    FlakyHandler.responses = [(200, '<table>ok</table>'), (502, 'Bad Gateway')]
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = AsyncHttpClient()
+    url = f"http://127.0.0.1:{server.server_address[1]}/tma"
+    try:
+        assert client.fetch_all([url])[url].body == '<table>ok</table>'
+        result = client.fetch_all([url])[url]
+        assert result.status == 502
+        assert result.error == 'HTTP 502'
+        assert result.body == '<table>ok</table>'
+    finally:
+        client.close()
+        server.shutdown()
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from controllers.BBWSScraper import RAINFALL_PATH, WATER_LEVEL_PATH, BBWSScraper, get_http_client
+from fixtures.bbws_server import start_server
+
+@pytest.fixture
+def bbws_server():
+    server, base_url = start_server(delay_ms=0)
+    yield base_url
+    server.shutdown()
+
+def test_poll_changes_emits_baseline_after_shared_cache_304(bbws_server):
+    # scrape_all mengisi cache ETag bersama; poll_changes scraper baru mendapat 304
+    water_levels, rainfall = BBWSScraper(bbws_server).scrape_all()
+    assert (len(water_levels), len(rainfall)) == (18, 28)
+
+    scraper = BBWSScraper(bbws_server)
+    changes = scraper.poll_changes()
+    assert scraper.last_fetch['/tma'].not_modified
+    assert (len(changes['water_levels']), len(changes['rainfall'])) == (18, 28)
+
+    # Poll berikutnya tanpa perubahan: tidak ada baris yang diteruskan
+    changes = scraper.poll_changes()
+    assert (len(changes['water_levels']), len(changes['rainfall'])) == (0, 0)
+
+def test_scrape_all_fetches_both_pages_in_one_round_trip():
+    server, base_url = start_server(delay_ms=300)
+    try:
+        scraper = BBWSScraper(base_url)
+        start = time.perf_counter()
+        water_levels, rainfall = scraper.scrape_all()
+        elapsed = time.perf_counter() - start
+
+        assert (len(water_levels), len(rainfall)) == (18, 28)
+        assert not any(record.get('fallback') for record in water_levels + rainfall)
+        # /tma dan /ch paralel: ~1x delay, bukan 2x
+        assert elapsed < 0.55
+
+        water_levels, rainfall = scraper.scrape_all()
+        assert scraper.last_fetch[WATER_LEVEL_PATH].not_modified
+        assert scraper.last_fetch[RAINFALL_PATH].not_modified
+        assert (len(water_levels), len(rainfall)) == (18, 28)
+    finally:
+        server.shutdown()
+
+def test_http_client_rejects_different_settings():
+    client = get_http_client()
+    assert get_http_client() is client
+    with pytest.raises(ValueError):
+        get_http_client(concurrency=client.concurrency + 1)
@@ -0,0 +1,22 @@
+from models.FloodReportModel import REPORT_COLUMNS, REPORT_DTYPES, FloodReportModel
+
+ROW = (1, 'Jl. Slamet Riyadi', 'Setinggi lutut', 'Budi', '0812', None, '10.0.0.1', '2026-01-02', '10:00',
+       '2026-01-02 10:00:00', 'pending', None)
+
+def to_dataframe(rows):
+    return FloodReportModel.__new__(FloodReportModel).reports_to_dataframe(rows)  # tanpa database
+
+def test_empty_result_keeps_column_dtypes():
+    empty, filled = to_dataframe([]), to_dataframe([ROW])
+
+    assert list(empty.columns) == REPORT_COLUMNS
+    assert empty.dtypes.equals(filled.dtypes)
+    assert str(empty['report_date'].dtype) == 'datetime64[ns]'
+    assert empty['address'].dtype == object
+    assert empty['status'].dtype == REPORT_DTYPES['status']
+    assert list(empty['flood_height'].cat.categories) == list(REPORT_DTYPES['flood_height'].categories)
+
+def test_unknown_status_is_kept_as_extra_category():
+    df = to_dataframe([ROW, ROW[:10] + ('verified', None)])
+    assert list(df['status'].cat.categories) == ['pending', 'verified']
+    assert df['status'].tolist() == ['pending', 'verified']
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from gumbel_distribution import (fit_gumbel_parameters, gumbel_cdf, gumbel_exceedance_probability,
+                                 gumbel_return_period, predict_flood_gumbel, predict_flood_gumbel_batch)
+
+def test_exceedance_probability_keeps_extreme_tail():
+    # 1 - F(x) jatuh ke 0 di sini; nilai sebenarnya ~exp(-(x - mu) / beta)
+    probability = gumbel_exceedance_probability(1000.0, 85.0, 22.5)
+    assert probability > 0
+    assert np.isclose(probability, np.exp(-(1000.0 - 85.0) / 22.5), rtol=1e-12)
+    assert np.isfinite(gumbel_return_period(1000.0, 85.0, 22.5))
+
+def test_exceedance_matches_one_minus_cdf_in_body():
+    x = np.linspace(0, 200, 21)
+    assert np.allclose(gumbel_exceedance_probability(x), 1.0 - gumbel_cdf(x))
+
+def test_scalar_x_with_array_parameters():
+    mu = np.array([80.0, 85.0, 90.0])
+    beta = np.array([20.0, 22.5, 25.0])
+    cdf = gumbel_cdf(100.0, mu, beta)
+    assert cdf.shape == (3,)
+    assert np.allclose(cdf, np.exp(-np.exp(-(100.0 - mu) / beta)))
+    assert gumbel_exceedance_probability(100.0, mu, beta).shape == (3,)
+
+def test_batch_accepts_list_input():
+    result = predict_flood_gumbel_batch([50.0, 100.0, 150.0])
+    assert result['risk_level'].shape == (3,)
+    assert result['status'].tolist() == [predict_flood_gumbel(x)['status'] for x in (50.0, 100.0, 150.0)]
+
+def test_batch_accepts_scalar_input():
+    for rainfall in (100.0, np.float64(100.0), np.array(100.0)):
+        result = predict_flood_gumbel_batch(rainfall)
+        assert result['risk_level'].shape == ()
+        assert float(result['risk_level']) == predict_flood_gumbel(100.0)['risk_level']
+        assert str(result['status']) == predict_flood_gumbel(100.0)['status']
+
+def test_constant_annual_maxima_are_rejected():
+    for method in ('moments', 'lmoments', 'mle'):
+        with pytest.raises(ValueError):
+            fit_gumbel_parameters([120.0] * 10, method=method)
+
+def test_non_finite_annual_maxima_have_their_own_error():
+    with pytest.raises(ValueError, match='NaN'):
+        fit_gumbel_parameters([120.0, np.nan, 95.0, 140.0])
+
+def test_batch_matches_scalar_including_status_boundaries():
+    mu, beta = 85.0, 22.5
+    # Curah hujan tepat di risk 0.4 / 0.7 / 1.0 (risk = 1.5 * F(x)) beserta tetangga terdekatnya
+    boundaries = [mu - beta * np.log(-np.log(risk / 1.5)) for risk in (0.4, 0.7, 1.0)]
+    rainfall = np.concatenate([[0.0, 50.0, 150.0, 400.0]] +
+                              [[np.nextafter(x, -np.inf), x, np.nextafter(x, np.inf)] for x in boundaries])
+
+    batch = predict_flood_gumbel_batch(rainfall, mu=mu, beta=beta)
+    scalar = [predict_flood_gumbel(float(x), mu=mu, beta=beta) for x in rainfall]
+
+    assert batch['risk_level'].tolist() == [result['risk_level'] for result in scalar]
+    assert batch['probability'].tolist() == [result['probability'] for result in scalar]
+    assert batch['status'].tolist() == [result['status'] for result in scalar]
+    assert set(batch['status']) == {'RENDAH', 'MENENGAH', 'TINGGI'}
@@ -0,0 +1,65 @@
+import numpy as np
+
+import model_ann
+from model_ann import NumpyMLP, get_ann_parameters
+
+def test_parameters_describe_trained_mlp_when_loaded(monkeypatch):
+    rng = np.random.default_rng(0)
+    sizes = [4, 8, 4, 1]
+    mlp = NumpyMLP([rng.normal(size=(a, b)) for a, b in zip(sizes, sizes[1:])],
+                   [np.zeros(b) for b in sizes[1:]], [300.0, 150.0, 100.0, 35.0],
+                   {'training_samples': 500, 'accuracy': 0.9, 'version': 'v3'})
+    monkeypatch.setattr(model_ann, 'get_mlp_model', lambda: mlp)
+
+    params = get_ann_parameters()
+    assert 'weights' not in params
+    assert params['layer_sizes'] == sizes
+    assert params['architecture'] == '4-8-4-1 Neural Network'
+    assert 'v3' in params['version']
+
+def test_parameters_report_linear_weights_without_mlp(monkeypatch):
+    monkeypatch.setattr(model_ann, 'get_mlp_model', lambda: None)
+    params = get_ann_parameters()
+    assert params['weights'] == [0.50, 0.25, 0.15, 0.10]
+    assert 'layer_sizes' not in params
+
+def test_inference_normalizes_with_mlp_factors(monkeypatch):
+    rng = np.random.default_rng(1)
+    sizes = [4, 8, 4, 1]
+    factors = [600.0, 200.0, 100.0, 40.0]
+    mlp = NumpyMLP([rng.normal(size=(a, b)) for a, b in zip(sizes, sizes[1:])],
+                   [np.zeros(b) for b in sizes[1:]], factors, {'training_samples': 500, 'accuracy': 0.9})
+    monkeypatch.setattr(model_ann, 'get_mlp_model', lambda: mlp)
+
+    features = np.array([[50.0, 90.0, 80.0, 27.0], [80.0, 100.0, 70.0, 30.0]])
+    expected = np.maximum(0.1, mlp.predict_normalized(features / np.array(factors)))
+
+    batch = model_ann.predict_flood_ann_batch(*features.T)
+    assert np.allclose(batch['risk_level'], np.round(expected, 3))
+    assert model_ann.predict_flood_ann(*features[0])['parameters_used']['normalization_factors'] == factors
+
+def test_batch_matches_scalar_including_status_boundaries(monkeypatch):
+    # MLP 4-1 monoton terhadap curah hujan agar ketiga status tercapai
+    mlp = NumpyMLP([np.array([[4.0], [0.5], [0.0], [0.0]])], [np.array([-2.5])], [300.0, 150.0, 100.0, 35.0])
+    monkeypatch.setattr(model_ann, 'get_mlp_model', lambda: mlp)
+    humidity, temperature = 80.0, 27.0
+
+    def status_code(rainfall, water_level):
+        return model_ann.predict_flood_ann_batch(rainfall, water_level, humidity, temperature)['status_code']
+
+    # Curah hujan (water_level 60) tempat status naik ke MENENGAH / TINGGI, dicari dengan bisection
+    rows = [(rain, water) for rain in (0.0, 100.0, 200.0, 300.0) for water in (60.0, 110.0, 130.0, 150.0)]
+    for code in (1, 2):
+        low, high = 0.0, 300.0
+        for _ in range(60):
+            middle = (low + high) / 2
+            low, high = (middle, high) if status_code(middle, 60.0) < code else (low, middle)
+        rows += [(np.nextafter(high, -np.inf), 60.0), (high, 60.0), (np.nextafter(high, np.inf), 60.0)]
+    rainfall, water_level = (np.array(column) for column in zip(*rows))
+
+    batch = model_ann.predict_flood_ann_batch(rainfall, water_level, humidity, temperature)
+    scalar = [model_ann.predict_flood_ann(float(rain), float(water), humidity, temperature) for rain, water in rows]
+
+    assert batch['risk_level'].tolist() == [result['risk_level'] for result in scalar]
+    assert batch['status'].tolist() == [result['status'] for result in scalar]
+    assert set(batch['status']) == {'RENDAH', 'MENENGAH', 'TINGGI'}
@@ -0,0 +1,39 @@
+import json
+import os
+
+import model_ann
+import model_store
+from gumbel_distribution import predict_flood_gumbel, predict_flood_gumbel_batch
+from model_store import DEFAULT_THRESHOLDS, ModelArtifactStore, publish_artifact, version_sort_key
+
+def test_version_sort_key_is_natural():
+    assert sorted(['v10', 'v9', 'v2'], key=version_sort_key) == ['v2', 'v9', 'v10']
+    assert sorted(['10', '2'], key=version_sort_key) == ['2', '10']
+
+def test_latest_version_follows_publish_order(tmp_path):
+    for version in ('v9', 'v10', 'baseline'):
+        publish_artifact(version, root=str(tmp_path))
+
+    assert ModelArtifactStore(root=str(tmp_path)).latest_version() == 'baseline'
+
+def test_latest_version_without_publish_time_uses_natural_order(tmp_path):
+    for version in ('v9', 'v10'):
+        os.makedirs(tmp_path / version)
+        with open(tmp_path / version / 'manifest.json', 'w') as f:
+            json.dump({'ann_layers': 0}, f)
+
+    assert ModelArtifactStore(root=str(tmp_path)).latest_version() == 'v10'
+
+def test_artifact_thresholds_drive_status_cutoffs(tmp_path, monkeypatch):
+    publish_artifact('v1', thresholds={'ann_high': 0.97, 'ann_medium': 0.95, 'gumbel_high': 0.05, 'gumbel_medium': 0.03}, root=str(tmp_path))
+    monkeypatch.setattr(model_store, '_default_store', ModelArtifactStore(root=str(tmp_path)))
+    monkeypatch.setattr(model_ann, 'get_mlp_model', lambda: None)
+
+    thresholds = model_store.get_status_thresholds()
+    assert thresholds == dict(DEFAULT_THRESHOLDS, ann_high=0.97, ann_medium=0.95, gumbel_high=0.05, gumbel_medium=0.03)
+
+    # Dengan threshold default: ANN 0.93 = TINGGI, Gumbel 0.072 = RENDAH
+    assert model_ann.predict_flood_ann(50.0, 90.0, 80.0, 27.0)['status'] == 'RENDAH'
+    assert model_ann.predict_flood_ann_batch([50.0], [90.0], [80.0], [27.0])['status'][0] == 'RENDAH'
+    assert predict_flood_gumbel(60.0)['status'] == 'TINGGI'
+    assert predict_flood_gumbel_batch([60.0])['status'][0] == 'TINGGI'
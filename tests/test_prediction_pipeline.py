@@ -0,0 +1,30 @@
+import model_store
+from controllers.PredictionPipeline import PredictionPipeline
+from model_store import ModelArtifact, publish_artifact
+
+WATER_LEVELS = [
+    {'location': 'Ngadipiro', 'water_level_mdpl': 100.0, 'last_update': '06:00', 'source': 'BBWS Bengawan Solo'},
+    {'location': 'Jurug', 'water_level_mdpl': 90.0, 'last_update': '06:00', 'source': 'BBWS Bengawan Solo'}
+]
+RAINFALL = [{'location': 'Purwantoro', 'rainfall_mm': 60.0}]
+
+def run_pipeline():
+    # Ngadipiro -> pos hujan Purwantoro, Jurug tanpa pos hujan
+    predictions, _ = PredictionPipeline(lambda water_levels, rainfall: [0, -1]).run(WATER_LEVELS, RAINFALL)
+    return predictions
+
+def test_published_gauge_fit_changes_gumbel_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_store, 'get_current_artifact', lambda: None)
+    default = run_pipeline()
+
+    path = publish_artifact('v1', gumbel_fits={'Purwantoro': {'mu_location': 40.0, 'beta_scale': 10.0}},
+                            root=str(tmp_path))
+    artifact = ModelArtifact(path)
+    monkeypatch.setattr(model_store, 'get_current_artifact', lambda: artifact)
+    fitted = run_pipeline()
+
+    # Fit dicari lewat nama pos hujan terkait, bukan nama pos TMA
+    assert fitted[0]['gumbel_risk'] != default[0]['gumbel_risk']
+    assert fitted[0]['gumbel_message'] != default[0]['gumbel_message']
+    # Pos TMA tanpa pos hujan tetap memakai parameter default
+    assert fitted[1]['gumbel_risk'] == default[1]['gumbel_risk']
@@ -0,0 +1,32 @@
+from query_cache import QueryCache, skip_cache
+
+def test_invalidate_during_compute_does_not_store_stale_value():
+    cache = QueryCache()
+
+    def compute():
+        # Laporan baru masuk saat query masih berjalan
+        cache.invalidate('reports')
+        return 'stale'
+
+    assert cache.get_or_compute('reports', 'today', 60, compute) == 'stale'
+    assert cache.get_or_compute('reports', 'today', 60, lambda: 'fresh') == 'fresh'
+    assert cache.get_or_compute('reports', 'today', 60, lambda: 'other') == 'fresh'
+
+def test_skipped_default_value_is_not_cached():
+    cache = QueryCache()
+
+    def failing_query():
+        skip_cache()
+        return []
+
+    assert cache.get_or_compute('reports', 'all', 60, failing_query) == []
+    assert cache.get_or_compute('reports', 'all', 60, lambda: ['report']) == ['report']
+
+def test_nested_skip_prevents_outer_caching():
+    cache = QueryCache()
+
+    def outer():
+        return {'today': cache.get_or_compute('visitors', 'today', 60, lambda: (skip_cache(), 0)[1])}
+
+    assert cache.get_or_compute('stats', 'all', 60, outer) == {'today': 0}
+    assert cache.get_or_compute('stats', 'all', 60, lambda: {'today': 5}) == {'today': 5}
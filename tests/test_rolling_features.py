@@ -0,0 +1,55 @@
+import time
+
+from controllers.BBWSScraper import BBWSScraper
+from rolling_features import RollingFeatureEngine
+
+def fallback_batch():
+    scraper = BBWSScraper.__new__(BBWSScraper)  # tanpa HTTP client, hanya data fallback
+    return scraper.get_fallback_water_data(), scraper.get_fallback_rainfall_data()
+
+def test_repeated_fallback_polls_do_not_accumulate():
+    engine = RollingFeatureEngine()
+    now = int(time.time())
+    engine.add_reading('rainfall_mm', 'Stasiun Hujan A', now - 3600, 10.0)
+    before = engine.rainfall_totals('Stasiun Hujan A', now)
+
+    # BBWS down: poll tiap menit selama 3 jam hanya mengembalikan data fallback
+    for _ in range(180):
+        water_levels, rainfall = fallback_batch()
+        assert engine.ingest(water_levels, rainfall) == 0
+
+    assert engine.rainfall_totals('Stasiun Hujan A', now) == before == [10.0, 10.0, 10.0]
+    assert engine.rainfall_totals('Stasiun Hujan B', now) is None
+    assert engine.water_rise('Ngadipiro (S. keduang)', now) == 0.0
+
+def test_records_without_observed_at_are_skipped():
+    engine = RollingFeatureEngine()
+    now = int(time.time())
+    rainfall = [{'location': 'Wonogiri', 'rainfall_mm': 5.0}, {'location': 'Baturetno', 'rainfall_mm': 2.0,
+                                                               'observed_at': now - 600}]
+
+    for _ in range(10):
+        engine.ingest([], rainfall)
+
+    assert engine.rainfall_totals('Wonogiri', now) is None
+    assert engine.rainfall_totals('Baturetno', now) == [2.0, 2.0, 2.0]
+
+def test_feature_matrix_matches_per_station_reads():
+    engine = RollingFeatureEngine(capacity=8)
+    now = 1_760_000_000
+    for step in range(12):  # lebih dari kapasitas: sampel tertua tertimpa
+        ts = now - (11 - step) * 1800
+        engine.add_reading('rainfall_mm', 'Wonogiri', ts, 1.0 + step)
+        engine.add_reading('water_level_mdpl', 'Jurug', ts, 80.0 + 0.1 * step)
+
+    water_levels = [{'location': 'Jurug', 'water_level_mdpl': 81.2},
+                    {'location': 'Pos Baru', 'water_level_mdpl': 90.0},
+                    {'location': 'Jurug', 'water_level_mdpl': 81.2}]
+    rainfall = [{'location': 'Wonogiri', 'rainfall_mm': 12.0}, {'location': 'Tanpa Riwayat', 'rainfall_mm': 4.0}]
+    matrix = engine.feature_matrix(water_levels, rainfall, [0, 1, -1], now)
+
+    assert engine.rainfall_totals('Wonogiri', now) == [57.0, 68.0, 68.0]
+    assert matrix[0].tolist() == [12.0] + engine.rainfall_totals('Wonogiri', now) + [81.2, matrix[0, 5]]
+    assert abs(matrix[0, 5] - 0.2) < 1e-9 and matrix[0, 5] == engine.water_rise('Jurug', now)
+    assert matrix[1].tolist() == [4.0, 4.0, 4.0, 4.0, 90.0, 0.0]
+    assert matrix[2].tolist() == [0.0, 0.0, 0.0, 0.0, 81.2, matrix[0, 5]]
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+from controllers.StationRegistry import StationRegistry
+
+WATER_LEVELS = [{'location': name, 'water_level_mdpl': 100.0} for name in ('Ngadipiro', 'Jurug', 'Nambangan', 'Kajangan')]
+RAINFALL = [{'location': name, 'rainfall_mm': value} for name, value in
+            (('Wonogiri', 2.5), ('Purwantoro', 32.0), ('Tawangmangu', 12.0), ('Simo', 60.5), ('Ponorogo', 5.0))]
+
+def test_gauges_join_to_nearest_or_downstream_station():
+    registry = StationRegistry()
+    assert registry.get_rainfall_station_water_station('Wonogiri')['id'] == 'wonogiri_dam'
+    # Pos hujan hulu dengan pos TMA hilir eksplisit
+    assert registry.get_rainfall_station_water_station('Tawangmangu')['id'] == 'jurug'
+    assert registry.get_rainfall_station_water_station('Ponorogo')['id'] == 'nambangan'
+    assert registry.nearest_water_station(-7.57, 110.82)[0]['id'] == 'jurug'
+
+def test_match_rainfall_picks_wettest_joined_gauge():
+    registry = StationRegistry()
+    # Kajangan hanya terhubung ke Sragen yang tidak punya pembacaan
+    assert registry.match_rainfall(WATER_LEVELS, RAINFALL) == [1, 3, 4, -1]
+    assert registry.match_rainfall([{'location': 'Ngadipiro (S. keduang)'}], [{'location': 'Stasiun Hujan A',
+                                                                             'rainfall_mm': 45.5}]) == [0]
+
+def test_registry_import_does_not_load_sklearn():
+    code = "import sys; import controllers.StationRegistry; print('sklearn' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,88 @@
+"""
+Training offline MLP 4-8-4-1 dari kejadian banjir berlabel (tabel flood_events).
+Bobot diexport ke .npz agar aplikasi Streamlit cukup memakai NumPy untuk inference.
+
+Usage: python train_ann.py [--output ann_weights.npz] [--min-samples 50] [--publish VERSION]
+
+--publish juga menulis versi baru ke model_artifacts/ (bobot MLP, normalisasi, dan
+fit Gumbel per stasiun) yang otomatis dipakai aplikasi tanpa restart.
+"""
+import argparse
+import numpy as np
+
+from model_ann import ANN_WEIGHTS_PATH, NORMALIZATION_FACTORS
+from model_store import publish_artifact
+
+def train_mlp(features, labels, random_state=42):
+    """Train MLPClassifier 4-8-4-1 (sigmoid) dan return (model, test_accuracy)"""
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.model_selection import train_test_split
+
+    X = np.asarray(features, dtype=float) / NORMALIZATION_FACTORS
+    y = np.asarray(labels, dtype=int)
+
+    stratify = y if len(np.unique(y)) > 1 else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=random_state, stratify=stratify
+    )
+
+    model = MLPClassifier(
+        hidden_layer_sizes=(8, 4),
+        activation='logistic',
+        solver='lbfgs',
+        max_iter=2000,
+        random_state=random_state
+    )
+    model.fit(X_train, y_train)
+
+    accuracy = model.score(X_test, y_test)
+    return model, accuracy
+
+def export_mlp_weights(model, path, training_samples, accuracy):
+    """Export bobot MLPClassifier ke file .npz yang dibaca NumpyMLP.load"""
+    arrays = {
+        'n_layers': np.array(len(model.coefs_)),
+        'normalization_factors': NORMALIZATION_FACTORS,
+        'training_samples': np.array(training_samples),
+        'accuracy': np.array(accuracy)
+    }
+    for i, (coef, intercept) in enumerate(zip(model.coefs_, model.intercepts_)):
+        arrays[f'coef_{i}'] = coef.astype(np.float64)
+        arrays[f'intercept_{i}'] = intercept.astype(np.float64)
+
+    np.savez_compressed(path, **arrays)
+
+def main():
+    parser = argparse.ArgumentParser(description="Train MLP prediksi banjir dari flood_events")
+    parser.add_argument('--output', default=ANN_WEIGHTS_PATH, help="Path file bobot .npz")
+    parser.add_argument('--min-samples', type=int, default=50, help="Minimal jumlah kejadian berlabel")
+    parser.add_argument('--publish', metavar='VERSION', help="Publish sebagai versi model artifact baru")
+    args = parser.parse_args()
+
+    from models.FloodEventModel import FloodEventModel
+    features, labels = FloodEventModel().get_labelled_events()
+
+    if len(features) < args.min_samples:
+        print(f"❌ Data training kurang: {len(features)} < {args.min_samples} kejadian berlabel")
+        return 1
+
+    model, accuracy = train_mlp(features, labels)
+    export_mlp_weights(model, args.output, len(features), accuracy)
+    print(f"✅ MLP dilatih dengan {len(features)} sampel (accuracy {accuracy:.3f}), bobot disimpan ke {args.output}")
+
+    if args.publish:
+        from controllers.GumbelFitController import GumbelFitController
+        path = publish_artifact(
+            args.publish,
+            mlp_coefs=model.coefs_,
+            mlp_intercepts=model.intercepts_,
+            normalization_factors=NORMALIZATION_FACTORS,
+            gumbel_fits=GumbelFitController().get_all_station_fits(),
+            training_samples=len(features),
+            accuracy=accuracy
+        )
+        print(f"✅ Model artifact dipublish ke {path}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
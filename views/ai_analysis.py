@@ -70,6 +70,18 @@ def show_technical_details():
     # Dapatkan parameter terbaru
     params = get_ann_parameters()
     
+    if 'layer_sizes' in params:
+        hidden_layers = ' dan '.join(str(size) for size in params['layer_sizes'][1:-1])
+        # MLP terlatih: tampilkan ukuran layer, bukan bobot linear lama
+        feature_info = f"- **Layer Sizes**: {' → '.join(str(size) for size in params['layer_sizes'])}"
+    else:
+        hidden_layers = '8 dan 4'
+        feature_info = f"""- **Feature Weights**:
+          * Curah Hujan: {params['weights'][0]} (paling berpengaruh)
+          * Tinggi Air: {params['weights'][1]}
+          * Kelembaban: {params['weights'][2]}  
+          * Suhu: {params['weights'][3]}"""
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -78,7 +90,7 @@ def show_technical_details():
         - **Type**: Artificial Neural Network (ANN)
         - **Architecture**: {params['architecture']}
         - **Input Layer**: 4 neurons (curah hujan, tinggi air, kelembaban, suhu)
-        - **Hidden Layers**: 8 dan 4 neurons dengan activation sigmoid
+        - **Hidden Layers**: {hidden_layers} neurons dengan activation sigmoid
         - **Output Layer**: 1 neuron (risk level 0-1)
         - **Activation**: {params['activation']}
         - **Version**: {params['version']}
@@ -88,11 +100,7 @@ def show_technical_details():
         st.subheader("⚙️ Parameter Training")
         st.markdown(f"""
         - **Training Data**: {params['training_samples']} samples historis
-        - **Feature Weights**:
-          * Curah Hujan: {params['weights'][0]} (paling berpengaruh)
-          * Tinggi Air: {params['weights'][1]}
-          * Kelembaban: {params['weights'][2]}  
-          * Suhu: {params['weights'][3]}
+        {feature_info}
         - **Accuracy**: {params['accuracy']*100}% pada test data
         - **Validation**: Cross-validation 5-fold
         """)
@@ -82,12 +82,12 @@ def show_flood_report_form(controller):
     # File validation
     photo_file_valid = False
     if photo_file is not None:
-        file_size = len(photo_file.getvalue()) / 1024 / 1024
-        if file_size > 5:
-            st.error(f"File terlalu besar! {file_size:.2f}MB > 5MB")
+        # Ukuran dari metadata + magic bytes chunk pertama, tanpa menyalin seluruh file
+        photo_file_valid, photo_message = controller.validate_photo(photo_file)
+        if photo_file_valid:
+            st.success(photo_message)
         else:
-            st.success(f"File {photo_file.name} ({file_size:.2f}MB) siap diupload")
-            photo_file_valid = True
+            st.error(photo_message)
     
     st.markdown("---")
     
@@ -55,7 +55,8 @@ def show_current_month_reports(controller):
             'Waktu': report['report_time'],
             'Pelapor': report['reporter_name'],
             'Foto Banjir': '✅' if report['photo_path'] else '❌',
-            'photo_path': report['photo_path']  # Hidden column for photo path
+            'photo_path': report['photo_path'],  # Hidden column for photo path
+            'thumbnail_path': report.get('thumbnail_path')  # Thumbnail WebP (laporan lama: None)
         })
     
     df = pd.DataFrame(df_data)
@@ -93,8 +94,12 @@ def show_current_month_reports(controller):
         with col5:
             st.write(row['Pelapor'])
         with col6:
-            photo_status = "✅" if row['Foto Banjir'] == '✅' else "❌"
-            st.write(photo_status)
+            # Thumbnail kecil di tabel; foto penuh hanya dimuat saat tombol ditekan
+            if row['thumbnail_path'] and os.path.exists(row['thumbnail_path']):
+                st.image(row['thumbnail_path'], width=80)
+            else:
+                photo_status = "✅" if row['Foto Banjir'] == '✅' else "❌"
+                st.write(photo_status)
         with col7:
             if row['Foto Banjir'] == '✅' and row['photo_path']:
                 if st.button("👁️ Lihat Foto", key=f"view_photo_{index}", use_container_width=True):
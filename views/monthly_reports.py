@@ -30,11 +30,10 @@ def show_monthly_reports_summary(controller):
     </style>
     """, unsafe_allow_html=True)
     
-    # Get monthly statistics and reports
+    # Get monthly statistics (rows tabel diambil per halaman di bawah)
     stats = controller.get_monthly_statistics()
-    reports = controller.get_month_reports()
     
-    if not reports:
+    if not stats['total_reports']:
         st.info("📊 Tidak ada laporan banjir untuk bulan ini.")
         return
     
@@ -79,28 +78,28 @@ def show_monthly_reports_summary(controller):
     st.markdown("---")
     st.markdown("### 📊 Visualisasi Data")
     
-    # Prepare data for charts
-    df_reports = pd.DataFrame(reports)
+    # Prepare data for charts (agregasi di SQL)
+    distribution = controller.get_month_distribution()
+    height_counts = distribution['height_counts']
+    daily_counts = distribution['daily_counts']
     
-    if not df_reports.empty:
+    if height_counts:
         col1, col2 = st.columns(2)
         
         with col1:
             # Flood height distribution
-            height_counts = df_reports['flood_height'].value_counts()
             fig_height = px.pie(
-                values=height_counts.values,
-                names=height_counts.index,
+                values=list(height_counts.values()),
+                names=list(height_counts.keys()),
                 title="Distribusi Ketinggian Banjir"
             )
             st.plotly_chart(fig_height, use_container_width=True)
         
         with col2:
             # Daily reports trend
-            daily_counts = df_reports['report_date'].value_counts().sort_index()
             fig_trend = px.line(
-                x=daily_counts.index,
-                y=daily_counts.values,
+                x=list(daily_counts.keys()),
+                y=list(daily_counts.values()),
                 title="Trend Laporan Harian",
                 labels={'x': 'Tanggal', 'y': 'Jumlah Laporan'}
             )
@@ -119,7 +118,7 @@ def show_monthly_reports_summary(controller):
     with col2:
         flood_height_filter = st.selectbox(
             "Filter ketinggian:",
-            ["Semua"] + list(df_reports['flood_height'].unique()) if not df_reports.empty else ["Semua"]
+            ["Semua"] + list(height_counts.keys())
         )
     
     with col3:
@@ -127,53 +126,45 @@ def show_monthly_reports_summary(controller):
         items_per_page_str = st.selectbox("Data per halaman:", ["10", "25", "50"], index=0)
         items_per_page = int(items_per_page_str)  # Convert string to integer
     
-    # Filter data
-    filtered_reports = reports
-    
-    if search_term:
-        filtered_reports = [r for r in filtered_reports 
-                          if search_term.lower() in r['address'].lower() 
-                          or search_term.lower() in r['reporter_name'].lower()]
-    
-    if flood_height_filter != "Semua":
-        filtered_reports = [r for r in filtered_reports if r['flood_height'] == flood_height_filter]
-    
-    # Pagination
-    total_pages = max(1, (len(filtered_reports) + items_per_page - 1) // items_per_page)
-    
-    # ✅ PERBAIKAN: Inisialisasi current_page untuk monthly reports
-    if 'monthly_current_page' not in st.session_state:
-        st.session_state.monthly_current_page = 1
-    
-    # ✅ PERBAIKAN: Konversi ke integer dan pastikan dalam range yang valid
-    try:
-        current_page = int(st.session_state.monthly_current_page)
-    except (ValueError, TypeError):
-        current_page = 1
-    
-    page = max(1, min(current_page, total_pages))
+    # Keyset pagination: stack cursor, elemen ke-i = cursor untuk halaman ke-(i+1)
+    filter_key = (search_term, flood_height_filter, items_per_page)
+    if st.session_state.get('monthly_filter_key') != filter_key:
+        st.session_state.monthly_filter_key = filter_key
+        st.session_state.monthly_cursor_stack = [None]
+    
+    cursor_stack = st.session_state.monthly_cursor_stack
+    page = len(cursor_stack)
+    
+    # Filter dan paging dijalankan di SQL, hanya baris halaman ini yang diambil
+    result = controller.get_reports_page(
+        search_term=search_term or None,
+        flood_height=flood_height_filter if flood_height_filter != "Semua" else None,
+        page_size=items_per_page,
+        cursor=cursor_stack[-1]
+    )
+    current_page_reports = result['reports']
+    total_filtered = result['total']
+    
+    total_pages = max(1, (total_filtered + items_per_page - 1) // items_per_page)
     start_idx = (page - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, len(filtered_reports))
+    end_idx = start_idx + len(current_page_reports)
     
     # Display pagination info
-    st.write(f"Menampilkan **{start_idx + 1}-{end_idx}** dari **{len(filtered_reports)}** laporan")
+    st.write(f"Menampilkan **{start_idx + 1 if current_page_reports else 0}-{end_idx}** dari **{total_filtered}** laporan")
     
     # Pagination controls
     col1, col2, col3 = st.columns([1, 2, 1])
     with col1:
         if st.button("⬅️ Sebelumnya") and page > 1:
-            st.session_state.monthly_current_page = page - 1
+            cursor_stack.pop()
             st.rerun()
     with col2:
         st.write(f"Halaman **{page}** dari **{total_pages}**")
     with col3:
-        if st.button("Selanjutnya ➡️") and page < total_pages:
-            st.session_state.monthly_current_page = page + 1
+        if st.button("Selanjutnya ➡️") and result['next_cursor'] is not None:
+            cursor_stack.append(result['next_cursor'])
             st.rerun()
     
-    # Display table for current page
-    current_page_reports = filtered_reports[start_idx:end_idx]
-    
     if current_page_reports:
         df_data = []
         for i, report in enumerate(current_page_reports, start=start_idx + 1):
@@ -184,7 +175,8 @@ def show_monthly_reports_summary(controller):
                 'Hari/Tanggal': format_report_date(report['report_date']),
                 'Pelapor': report['reporter_name'],
                 'Foto': '✅' if report['photo_path'] else '❌',
-                'photo_path': report['photo_path']
+                'photo_path': report['photo_path'],
+                'thumbnail_path': report.get('thumbnail_path')
             })
         
         df_display = pd.DataFrame(df_data)
@@ -202,7 +194,11 @@ def show_monthly_reports_summary(controller):
             with col4:
                 st.write(row['Pelapor'])
             with col5:
-                st.write(row['Foto'])
+                # Thumbnail kecil di tabel; foto penuh hanya dimuat saat tombol ditekan
+                if row['thumbnail_path'] and os.path.exists(row['thumbnail_path']):
+                    st.image(row['thumbnail_path'], width=80)
+                else:
+                    st.write(row['Foto'])
             with col6:
                 if row['Foto'] == '✅' and row['photo_path']:
                     if st.button("👁️ Lihat", key=f"monthly_photo_{index}", use_container_width=True):
@@ -28,9 +28,15 @@ def show_prediction_dashboard(controller):
     </style>
     """, unsafe_allow_html=True)
     
-    # Ambil data real-time
-    with st.spinner("🔄 Mengambil data real-time dari BBWS Bengawan Solo..."):
-        predictions = controller.get_comprehensive_data()
+    # Ambil data real-time (snapshot dari scheduler background, render tidak memanggil BBWS)
+    predictions = controller.get_comprehensive_data()
+    snapshot_info = controller.get_snapshot_info()
+    if snapshot_info:
+        st.caption(f"🔄 Data diperbarui {snapshot_info['generated_at']:%H:%M:%S} "
+                   f"(poll #{snapshot_info['sequence']}, {snapshot_info['poll_ms']:.0f} ms, "
+                   f"prediksi {snapshot_info['timings'].get('total', 0):.1f} ms)")
+        if snapshot_info['error']:
+            st.warning(f"⚠️ Data tidak terkini: {snapshot_info['error']}")
     
     # 1. STATUS RISIKO OVERALL
     overall_status, status_color = controller.get_overall_risk_status(predictions)